@@ -0,0 +1,214 @@
+# assets.py
+
+import threading
+import time
+import pygame
+
+class AssetCache:
+    def __init__(self):
+        """Initializes an empty cache of decoded and scaled surfaces."""
+        # Keyed by (path, size); size is None for images used at native size
+        self._surfaces = {}
+        self._rotations = {}
+        self._sounds = {}
+        self._masks = {}
+        self.bundle = None  # optional pre-decoded AssetBundle, checked before the files
+        # Held while loading so the background loader and the game never decode twice
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def attach_bundle(self, bundle):
+        self.bundle = bundle
+
+    def get_image(self, path, size=None):
+        """Returns the surface for an image, decoding and scaling it only the first time."""
+        key = (path, size)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        with self._lock:
+            surface = self._surfaces.get(key)
+            if surface is not None:
+                self.hits += 1
+                return surface
+            self.misses += 1
+            # Bundled images are stored already scaled to the size asked for
+            surface = self.bundle.image(path, size) if self.bundle is not None else None
+            prescaled = surface is not None
+            if surface is None:
+                surface = pygame.image.load(path)
+            # convert_alpha() needs a display mode; headless runs keep the decoded format
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+            if size is not None and not prescaled:
+                surface = pygame.transform.scale(surface, size)
+            self._surfaces[key] = surface
+            return surface
+
+    def get_mask(self, path, size=None):
+        """Returns the shared collision Mask of an image (opaque where alpha >= 128)."""
+        key = (path, size)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = pygame.mask.from_surface(self.get_image(path, size))
+            self._masks[key] = mask
+        return mask
+
+    def get_solid_mask(self, size):
+        """Returns a shared fully-set Mask, for solid rectangles such as pillar bodies."""
+        key = (None, size)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = pygame.Mask(size, fill=True)
+            self._masks[key] = mask
+        return mask
+
+    def get_solid_surface(self, size, color):
+        """Returns a shared surface filled with one colour, to blit where a fill would be slow."""
+        key = (None, size, color)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()
+            surface.fill(color)
+            self._surfaces[key] = surface
+        return surface
+
+    def get_circle_mask(self, radius):
+        """Returns a shared Mask of a filled circle, for round hit areas such as the drone's mass."""
+        key = ('circle', radius)
+        mask = self._masks.get(key)
+        if mask is None:
+            surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surface, (255, 255, 255), (radius, radius), radius)
+            mask = pygame.mask.from_surface(surface)
+            self._masks[key] = mask
+        return mask
+
+    def get_sound(self, path):
+        """Returns a shared Sound, from the bundle's PCM if it matches the mixer format."""
+        sound = self._sounds.get(path)
+        if sound is not None:
+            return sound
+        with self._lock:
+            sound = self._sounds.get(path)
+            if sound is None:
+                sound = self.bundle.sound(path) if self.bundle is not None else None
+                if sound is None:
+                    sound = pygame.mixer.Sound(path)
+                self._sounds[path] = sound
+            return sound
+
+    def preload(self, entries):
+        """Decodes a list of (path, size) pairs up front so gameplay never touches the disk."""
+        for path, size in entries:
+            if (path, size) not in self._surfaces:
+                self.get_image(path, size)
+
+    def memory_bytes(self):
+        """Returns the number of bytes of pixel data held by the cache."""
+        total = sum(s.get_pitch() * s.get_height() for s in self._surfaces.values())
+        return total + sum(r.memory_bytes() for r in self._rotations.values())
+
+    def stats(self):
+        """Returns hit/miss counts and memory usage for reporting."""
+        return {
+            'entries': len(self._surfaces),
+            'sounds': len(self._sounds),
+            'hits': self.hits,
+            'misses': self.misses,
+            'bytes': self.memory_bytes(),
+        }
+
+    def get_rotations(self, path, size, step=1, max_angle=30, smooth=False):
+        """Returns a shared RotationCache of the image, pre-rendered every `step` degrees."""
+        key = (path, size, step, max_angle, smooth)
+        rotations = self._rotations.get(key)
+        if rotations is None:
+            rotations = RotationCache(self.get_image(path, size), step, max_angle, smooth)
+            self._rotations[key] = rotations
+        return rotations
+
+    def clear(self):
+        """Drops every cached surface (e.g. after the display mode changes)."""
+        self._surfaces.clear()
+        self._rotations.clear()
+        self._sounds.clear()
+        self._masks.clear()
+        self.hits = 0
+        self.misses = 0
+
+class RotationCache:
+    def __init__(self, image, step=1, max_angle=30, smooth=False):
+        """Pre-renders an image at every `step` degrees between -max_angle and +max_angle."""
+        self.step = step
+        self.max_angle = max_angle
+        count = int(2 * max_angle / step) + 1
+        self.frames = []
+        for i in range(count):
+            angle = -max_angle + i * step
+            if smooth:
+                self.frames.append(pygame.transform.rotozoom(image, angle, 1))
+            else:
+                self.frames.append(pygame.transform.rotate(image, angle))
+        # Half sizes let callers centre a frame without building a Rect
+        self.offsets = [(f.get_width() // 2, f.get_height() // 2) for f in self.frames]
+        # Bounds any frame, for sweeping the sprite while its angle changes
+        self.max_offset = (max(w for w, h in self.offsets), max(h for w, h in self.offsets))
+        # Collision masks, one per frame, so a rotated hit test never renders anything
+        self.masks = [pygame.mask.from_surface(f) for f in self.frames]
+
+    def index(self, angle):
+        """Index of the pre-rendered frame nearest to angle (clamped to the cached range)."""
+        angle = max(-self.max_angle, min(angle, self.max_angle))
+        return min(int((angle + self.max_angle) / self.step + 0.5), len(self.frames) - 1)
+
+    def get(self, angle):
+        return self.frames[self.index(angle)]
+
+    def memory_bytes(self):
+        return sum(f.get_pitch() * f.get_height() for f in self.frames)
+
+class AssetLoader:
+    def __init__(self, cache, images, sounds=()):
+        """Loads (path, size) images and sound paths into a cache on a daemon thread.
+
+        The game keeps drawing while this runs; anything it asks the cache for
+        in the meantime is loaded on demand, and never twice.
+        """
+        self.cache = cache
+        self.images = images
+        self.sounds = sounds
+        self.ready = threading.Event()
+        self.elapsed = None
+        self.error = None
+        self.thread = threading.Thread(target=self.run, name='asset-loader', daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            self.cache.preload(self.images)
+            for path in self.sounds:
+                self.cache.get_sound(path)
+        except Exception as error:
+            self.error = error
+        finally:
+            self.elapsed = time.perf_counter() - start
+            self.ready.set()
+
+    def wait(self):
+        """Blocks until everything is loaded, re-raising any error from the thread."""
+        self.ready.wait()
+        if self.error is not None:
+            raise self.error
+
+# --- Shared instance used by every sprite in the game ---
+asset_cache = AssetCache()
@@ -0,0 +1,111 @@
+# autopilot.py
+
+import time
+from collections import deque
+from simulation import ACTION_NONE, ACTION_UP, ACTION_DOWN
+from profiler import profiler
+
+ACTIONS = (ACTION_NONE, ACTION_UP, ACTION_DOWN)
+CRASH_PENALTY = 1_000_000
+
+def target_y(sim):
+    """Height to aim for: the middle of the next pillar gap, or round the next rock or puff.
+
+    Obstacles are kept in spawn order, so the first one still ahead of the
+    drone is the next to pass.
+    """
+    player = sim.player
+    left = player.rect.left - 10
+    for o in sim.obstacles:
+        if o.right() <= left:
+            continue
+        if o.event.kind == 'pillar':
+            return o.gap_y + o.gap_size / 2
+        # Pass on whichever side of it is nearer
+        above = o.rect.top - 40
+        below = o.rect.bottom + 40
+        y = player.position.y
+        return above if abs(y - above) < abs(y - below) else below
+    return sim.height / 2
+
+def evaluate(sim):
+    """Higher is better: surviving first, then score, then how close the drone is to target_y()."""
+    if sim.done:
+        # A later crash beats an earlier one
+        return sim.frame - CRASH_PENALTY
+    return sim.score * 1000 - abs(sim.player.position.y - target_y(sim))
+
+class Autopilot:
+    def __init__(self, budget_ms=8, beam_width=3, depth=6, segment_s=0.1):
+        """Plans thrust by beam search over simulated futures of the live Simulation.
+
+        The search holds one of NONE/UP/DOWN for each segment of `segment_s`
+        seconds, keeps the best `beam_width` plans at each of `depth`
+        segments, and stops early once `budget_ms` is spent so a frame is
+        never missed. Only the first segment of the best plan is flown
+        before planning again. budget_ms=None searches the full depth, which
+        keeps headless runs deterministic.
+        """
+        self.budget_ms = budget_ms
+        self.beam_width = beam_width
+        self.depth = depth
+        self.segment_s = segment_s
+        self.plan = deque()
+        self.last_plan_ms = 0.0
+        self.last_plan_depth = 0
+
+    def reset(self):
+        self.plan.clear()
+
+    def __call__(self, sim):
+        return self.next_action(sim)
+
+    def next_action(self, sim):
+        """Returns the action for the next tick, planning again whenever the last plan runs out."""
+        if sim.frame == 0:
+            self.plan.clear()  # a new episode
+        if not self.plan:
+            ticks = max(1, round(sim.tick_rate * self.segment_s))
+            action = self.search(sim, ticks)
+            self.plan.extend([action] * ticks)
+            profiler.mark('autopilot')
+        return self.plan.popleft()
+
+    def search(self, sim, ticks):
+        """Returns the first action of the best plan found. The world is restored afterwards."""
+        start = time.perf_counter()
+        deadline = None if self.budget_ms is None else start + self.budget_ms / 1000
+        root = sim.snapshot()
+        beams = [(0.0, None, root)]  # (value, first action, snapshot or None once crashed)
+        best_action = ACTION_NONE
+        self.last_plan_depth = 0
+        with profiler.suspended():
+            for level in range(self.depth):
+                # The first level always finishes, so there is always an answer
+                children = self.expand(sim, beams, ticks, deadline if level else None)
+                if children is None:
+                    break
+                children.sort(key=lambda c: c[0], reverse=True)
+                best_action = children[0][1]
+                self.last_plan_depth = level + 1
+                beams = [c for c in children if c[2] is not None][:self.beam_width]
+                if not beams:
+                    break
+            sim.restore(root)
+        self.last_plan_ms = (time.perf_counter() - start) * 1000
+        return best_action
+
+    def expand(self, sim, beams, ticks, deadline):
+        """Tries every action for one more segment after each beam. Returns None if time runs out."""
+        children = []
+        for value, first, snapshot in beams:
+            for action in ACTIONS:
+                sim.restore(snapshot)
+                for _ in range(ticks):
+                    sim.step(action)
+                    if sim.done: break
+                child = None if sim.done else sim.snapshot()
+                children.append((evaluate(sim), action if first is None else first, child))
+            if deadline is not None and time.perf_counter() > deadline:
+                return None
+        return children
@@ -0,0 +1,91 @@
+# benchmarks/bench_collision.py
+#
+# Compares the old shrunk-rectangle crash test with the bounding-box
+# prefilter plus pixel-mask test the simulation uses now. The drone is swept
+# over a grid of heights and angles in a crowded world; for each placement
+# both tests run, and the script reports the cost per check and how often
+# the rectangles disagree with the pixels.
+#
+#     SDL_VIDEODRIVER=dummy python benchmarks/bench_collision.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from simulation import Simulation
+from course import Course
+from runner import gap_seeking_policy
+
+class CrowdedSimulation(Simulation):
+    """A pillar/rock/puff mix packed tightly enough that the drone always has neighbours."""
+    def make_course(self, seed):
+        return Course(seed, self.width, self.height, spacing=(120, 200))
+
+    def crash(self, events):
+        pass
+
+def rect_hit(sim):
+    """The old test: the drone rect and every obstacle box shrunk by 15 pixels, through the index."""
+    rect = sim.player.rect
+    sx = sim.scroll_x
+    # The index now holds full-size boxes, so shrink the query by the obstacles' 7-8 pixels too
+    return bool(sim.obstacle_index.query(rect.left + 14 + sx, rect.top + 14, rect.right - 16 + sx, rect.bottom - 16))
+
+def mask_hit(sim):
+    """The current test, as check_collisions() runs it."""
+    mask, left, top = sim.player.hit_mask()
+    w, h = mask.get_size()
+    sx = sim.scroll_x
+    for entity in sim.obstacle_index.query(left + sx, top, left + w + sx, top + h):
+        if entity.overlaps_mask(mask, left, top):
+            return True
+    return False
+
+def placements(sim, heights=range(20, 700, 4), angles=range(-30, 31, 10)):
+    """Moves the drone through every (height, angle) pair, yielding after each move."""
+    player = sim.player
+    for y in heights:
+        for angle in angles:
+            player.position.y = y
+            player.rotation_angle = angle
+            player.rect.center = player.position
+            yield
+
+if __name__ == "__main__":
+    pygame.init()
+    pygame.display.set_mode((1280, 720))
+    sim = CrowdedSimulation(1280, 720, seed=5)
+    sim.score = 30
+
+    checks = agree = phantom = missed = 0
+    rect_time = mask_time = 0.0
+    for frame in range(1200):
+        sim.step(gap_seeking_policy(sim))
+        if frame % 20:
+            continue
+        saved = sim.player.snapshot()
+        for _ in placements(sim):
+            start = time.perf_counter()
+            old = rect_hit(sim)
+            middle = time.perf_counter()
+            new = mask_hit(sim)
+            rect_time += middle - start
+            mask_time += time.perf_counter() - middle
+            checks += 1
+            if old == new:
+                agree += 1
+            elif old:
+                phantom += 1
+            else:
+                missed += 1
+        sim.player.restore(saved)
+
+    print(f"{checks} placements")
+    print(f"shrunk rects:     {rect_time / checks * 1e6:6.2f} us/check")
+    print(f"prefilter + mask: {mask_time / checks * 1e6:6.2f} us/check")
+    print(f"rects agree with the pixels on {agree / checks:.1%}: "
+          f"{phantom} hits on transparent pixels, {missed} touches missed")
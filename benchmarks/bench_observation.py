@@ -0,0 +1,86 @@
+# benchmarks/bench_observation.py
+#
+# Observations/sec for each kind of observation.py output. Simulation steps
+# run between observations but are not timed.
+#
+#     SDL_VIDEODRIVER=dummy python benchmarks/bench_observation.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import pygame
+from simulation import Simulation
+from assets import asset_cache
+from bundle import asset_manifest
+from runner import gap_seeking_policy
+from observation import FrameObserver, features, features_batch, observe_batch
+
+WIDTH, HEIGHT = 1280, 720
+BATCH = 16
+
+def rate(sims, observe, count):
+    """Returns observations/sec; observe(sims) must return how many observations it made."""
+    for _ in range(30):
+        observe(sims)
+    made = 0
+    elapsed = 0.0
+    for _ in range(count):
+        for sim in sims:
+            sim.step(gap_seeking_policy(sim))
+            if sim.done:
+                sim.reset(sim.seed + len(sims))
+        start = time.perf_counter()
+        made += observe(sims)
+        elapsed += time.perf_counter() - start
+    return made / elapsed
+
+def view_only(observer):
+    def observe(sims):
+        with observer.pixels() as frame:
+            frame.rgb[0, 0]
+        return 1
+    return observe
+
+def single(observer):
+    out = observer.observe()
+    def observe(sims):
+        observer.observe(out)
+        return 1
+    return observe
+
+def batched(observers):
+    out = observe_batch(observers)
+    def observe(sims):
+        observe_batch(observers, out)
+        return len(observers)
+    return observe
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Observations/sec for each observation type.")
+    parser.add_argument('--count', type=int, default=300)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    asset_cache.preload(asset_manifest(WIDTH, HEIGHT)[0])
+
+    sim = Simulation(WIDTH, HEIGHT, seed=1)
+    sims = [Simulation(WIDTH, HEIGHT, seed=i) for i in range(BATCH)]
+    feature_out = features_batch(sims)
+    cases = [
+        ("features", [sim], lambda sims: (features(sims[0]), 1)[1]),
+        (f"features, batch of {BATCH}", sims, lambda sims: (features_batch(sims, out=feature_out), len(sims))[1]),
+        ("RGB 1280x720 view (no copy)", [sim], view_only(FrameObserver(sim, factor=1, grayscale=False))),
+        ("RGB 1280x720 copy", [sim], single(FrameObserver(sim, factor=1, grayscale=False))),
+        ("gray 320x180", [sim], single(FrameObserver(sim, factor=4))),
+        ("gray 160x90", [sim], single(FrameObserver(sim, factor=8))),
+        ("gray 80x45", [sim], single(FrameObserver(sim, factor=8, stride=2))),
+        (f"gray 160x90, batch of {BATCH}", sims, batched([FrameObserver(s, factor=8) for s in sims])),
+    ]
+    for name, case_sims, observe in cases:
+        print(f"{name:32s}{rate(case_sims, observe, args.count):10.0f} obs/s")
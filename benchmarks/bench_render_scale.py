@@ -0,0 +1,62 @@
+# benchmarks/bench_render_scale.py
+#
+# Times a late-game frame (step, draw, upscale, display update) at each
+# internal render resolution the 1280x720 window divides into.
+#
+#     SDL_VIDEODRIVER=dummy python benchmarks/bench_render_scale.py
+#     SDL_VIDEODRIVER=dummy python benchmarks/bench_render_scale.py --renderer dirty --frames 1000
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import pygame
+from simulation import Simulation
+from assets import asset_cache
+from bundle import asset_manifest
+from renderer import SceneRenderer, RENDER_MODES
+from runner import gap_seeking_policy
+
+WIDTH, HEIGHT = 1280, 720
+FACTORS = (1, 2, 4, 5, 8)
+
+def frame_ms(screen, factor, mode, frames):
+    """Returns the mean and worst milliseconds per frame at one render scale."""
+    sim = Simulation(WIDTH, HEIGHT, seed=2)
+    renderer = SceneRenderer(screen, sim, mode, factor)
+    renderer.preload()
+    def restart():
+        sim.reset(sim.seed + 1)
+        sim.score = 30
+    restart()
+    times = []
+    for i in range(frames + 30):
+        start = time.perf_counter()
+        sim.step(gap_seeking_policy(sim))
+        if sim.done:
+            restart()
+        rects = renderer.render("PLAYING")
+        if rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(rects)
+        if i >= 30:  # the first frames fill the text and blit caches
+            times.append(time.perf_counter() - start)
+    return sum(times) / len(times) * 1000, max(times) * 1000
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Frame time at each internal render resolution.")
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--renderer', choices=RENDER_MODES, default='full')
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    asset_cache.preload(asset_manifest(WIDTH, HEIGHT)[0])
+    for factor in FACTORS:
+        mean, worst = frame_ms(screen, factor, args.renderer, args.frames)
+        print(f"{WIDTH // factor:4d}x{HEIGHT // factor:<4d} (x{factor})  {mean:6.2f} ms/frame  worst {worst:6.2f} ms")
@@ -0,0 +1,54 @@
+# benchmarks/bench_rotation.py
+#
+# Compares rotating the drone sprite every frame (the old Drone.draw) with
+# looking the frame up in a pre-rendered RotationCache.
+#
+#     SDL_VIDEODRIVER=dummy python benchmarks/bench_rotation.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from assets import asset_cache
+
+FRAMES = 20000
+
+def angles():
+    """A swinging angle sweep like the one the pendulum produces."""
+    for i in range(FRAMES):
+        yield 30 * ((i % 240) / 120 - 1)
+
+def bench_live_rotate(screen, image):
+    start = time.perf_counter()
+    for angle in angles():
+        rotated = pygame.transform.rotate(image, angle)
+        screen.blit(rotated, rotated.get_rect(center=(320, 360)))
+    return time.perf_counter() - start
+
+def bench_cached(screen, rotations):
+    start = time.perf_counter()
+    for angle in angles():
+        i = rotations.index(angle)
+        half_w, half_h = rotations.offsets[i]
+        screen.blit(rotations.frames[i], (320 - half_w, 360 - half_h))
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+    image = asset_cache.get_image('assets/planeBlue1.png', (60, 45))
+
+    live = bench_live_rotate(screen, image)
+    print(f"live rotate:        {live / FRAMES * 1e6:7.2f} us/frame")
+    for step, smooth in ((1, False), (2, False), (1, True)):
+        start = time.perf_counter()
+        rotations = asset_cache.get_rotations('assets/planeBlue1.png', (60, 45), step, 30, smooth)
+        build = time.perf_counter() - start
+        cached = bench_cached(screen, rotations)
+        label = f"cache step={step}{' smooth' if smooth else ''}"
+        print(f"{label:20s}{cached / FRAMES * 1e6:7.2f} us/frame  "
+              f"({live / cached:.1f}x, built in {build * 1000:.1f} ms, {rotations.memory_bytes() // 1024} KiB)")
@@ -0,0 +1,45 @@
+# benchmarks/bench_startup.py
+#
+# Times loading every image and sound the game uses into an empty cache,
+# once from the PNG and WAV files and once from the memory-mapped bundle.
+# Build the bundle first with `python bundle.py`.
+#
+#     SDL_VIDEODRIVER=dummy SDL_AUDIODRIVER=dummy python benchmarks/bench_startup.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from assets import AssetCache
+from bundle import BUNDLE_PATH, AssetBundle, asset_manifest
+
+def load_all(images, sounds, bundle=None):
+    """Returns seconds to fill a fresh cache, and the cache."""
+    cache = AssetCache()
+    start = time.perf_counter()
+    if bundle is not None:
+        cache.attach_bundle(AssetBundle(bundle))
+    cache.preload(images)
+    for path in sounds:
+        cache.get_sound(path)
+    return time.perf_counter() - start, cache
+
+if __name__ == "__main__":
+    pygame.init()
+    pygame.display.set_mode((1280, 720))
+    images, sounds = asset_manifest(1280, 720)
+    # start.wav isn't shipped with the repo; time the sounds that are
+    sounds = [path for path in sounds if os.path.exists(path)]
+
+    files, cache = load_all(images, sounds)
+    print(f"files:  {files * 1000:7.1f} ms  ({len(images)} images, {len(sounds)} sounds)")
+    if not os.path.exists(BUNDLE_PATH):
+        print("no bundle yet; run python bundle.py")
+        sys.exit(0)
+    bundled, cache = load_all(images, sounds, BUNDLE_PATH)
+    print(f"bundle: {bundled * 1000:7.1f} ms  ({files / bundled:.1f}x, "
+          f"{os.path.getsize(BUNDLE_PATH) / 1e6:.1f} MB mapped)")
@@ -0,0 +1,73 @@
+# benchmarks/check_drone_batch.py
+#
+# Checks that DroneBatch stays in step with scalar Drone objects: both are
+# driven by the same random actions at several step sizes, drones that hit
+# the ceiling or the ground stop (the scalar ones are no longer stepped, the
+# batch rows are frozen by check_crashes()), and the script exits with
+# status 1 if DroneBatch.max_error() ever goes above TOLERANCE or the two
+# disagree on which drones have crashed.
+#
+#     python benchmarks/check_drone_batch.py
+#     python benchmarks/check_drone_batch.py --drones 64 --steps 5000
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import random
+import numpy as np
+from drone import Drone
+from drone_batch import DroneBatch
+from simulation import Simulation, ACTION_UP, ACTION_DOWN
+
+TOLERANCE = 1e-9
+STEP_SIZES = (0.5, 1.0, 2.0)  # dt in 60 Hz frames: 120, 60 and 30 ticks a second
+
+def max_error(count, steps, dt, seed, ground_y):
+    """Returns the largest DroneBatch.max_error() seen while stepping `count` drones `steps` times.
+
+    A step where the batch and the scalar drones disagree on who has crashed counts as an infinite error.
+    """
+    rng = random.Random(seed)
+    drones = [Drone(1280, 720) for _ in range(count)]
+    for d in drones:
+        # Start the pendulums swinging so the mass and torque terms are exercised too
+        d.mass_angle = rng.uniform(-0.5, 0.5)
+        d.mass_angular_velocity = rng.uniform(-0.05, 0.05)
+    batch = DroneBatch.from_drones(drones)
+    alive = [True] * count
+    worst = 0.0
+    for _ in range(steps):
+        actions = [rng.randrange(4) for _ in range(count)]
+        for i, (d, action) in enumerate(zip(drones, actions)):
+            if not alive[i]:
+                continue
+            if action & ACTION_UP: d.move_up()
+            if action & ACTION_DOWN: d.move_down()
+            d.update(dt)
+            alive[i] = not (d.rect.top <= 0 or d.rect.bottom >= ground_y + 10)
+        batch.step(np.array(actions), dt)
+        batch.check_crashes(ground_y)
+        if list(batch.alive) != alive:
+            return float('inf')
+        worst = max(worst, batch.max_error(drones))
+    return worst
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare DroneBatch with scalar Drones on random actions.")
+    parser.add_argument('--drones', type=int, default=16)
+    parser.add_argument('--steps', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    ground_y = Simulation(1280, 720).ground_y
+    failed = False
+    for dt in STEP_SIZES:
+        error = max_error(args.drones, args.steps, dt, args.seed, ground_y)
+        ok = error <= TOLERANCE
+        failed = failed or not ok
+        print(f"dt {dt:<4} max error {error:.3g}  {'ok' if ok else f'FAIL (tolerance {TOLERANCE:g})'}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,182 @@
+# benchmarks/run_benchmarks.py
+#
+# Headless frame-rate and allocation benchmarks with regression thresholds.
+#
+#     python benchmarks/run_benchmarks.py                    # compare with baseline.json
+#     python benchmarks/run_benchmarks.py --update-baseline  # record a new baseline
+#     python benchmarks/run_benchmarks.py --margin 0.3 --only stress
+#
+# Exits with status 1 if any scenario's frames/sec drops, or its per-frame
+# allocation grows, by more than the margin relative to the baseline.
+
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+import pygame
+from simulation import Simulation
+from course import Course
+from renderer import SceneRenderer
+from runner import gap_seeking_policy
+
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+WIDTH, HEIGHT = 1280, 720
+
+class StressSimulation(Simulation):
+    """Spawns about every frame and never crashes, so hundreds of obstacles stay live."""
+    def make_course(self, seed):
+        return Course(seed, self.width, self.height, spacing=(5, 5))
+
+    def crash(self, events):
+        pass
+
+def early_game(screen):
+    """Pillars only: the score stays under 15 so the spawner never mixes types."""
+    sim = Simulation(WIDTH, HEIGHT, seed=1)
+    renderer = SceneRenderer(screen, sim)
+    def frame():
+        sim.step(gap_seeking_policy(sim))
+        if sim.done or sim.score >= 15:
+            sim.reset(sim.seed + 1)
+        return renderer.render("PLAYING")
+    return frame
+
+def late_game(screen):
+    """The 3-way pillar/rock/puff rotation main.py switches to at 30 points."""
+    sim = Simulation(WIDTH, HEIGHT, seed=2)
+    renderer = SceneRenderer(screen, sim)
+    def restart():
+        sim.reset(sim.seed + 1)
+        sim.score = 30
+    restart()
+    def frame():
+        sim.step(gap_seeking_policy(sim))
+        if sim.done:
+            restart()
+        return renderer.render("PLAYING")
+    return frame
+
+def stress(screen):
+    """Hundreds of live obstacles on screen at once."""
+    sim = StressSimulation(WIDTH, HEIGHT, seed=3)
+    sim.score = 30
+    renderer = SceneRenderer(screen, sim)
+    # Fill the screen before timing starts
+    for _ in range(400):
+        sim.step(gap_seeking_policy(sim))
+    def frame():
+        sim.step(gap_seeking_policy(sim))
+        return renderer.render("PLAYING")
+    return frame
+
+def game_over(screen):
+    """The GAME_OVER screen drawn over a frozen world."""
+    sim = Simulation(WIDTH, HEIGHT, seed=4)
+    while not sim.done:
+        sim.step(gap_seeking_policy(sim))
+    renderer = SceneRenderer(screen, sim)
+    def frame():
+        return renderer.render("GAME_OVER")
+    return frame
+
+SCENARIOS = {
+    'early_game': early_game,
+    'late_game': late_game,
+    'stress': stress,
+    'game_over': game_over,
+}
+
+def present(rects):
+    if rects is None:
+        pygame.display.update()
+    else:
+        pygame.display.update(rects)
+
+def run_scenario(screen, make_frame, frames, alloc_frames):
+    """Returns frames/sec and the mean transient bytes allocated per frame."""
+    frame = make_frame(screen)
+    for _ in range(30):
+        present(frame())
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        present(frame())
+    fps = frames / (time.perf_counter() - start)
+
+    # Allocation pass is separate so tracemalloc's overhead doesn't skew the timing
+    tracemalloc.start()
+    allocated = 0
+    for _ in range(alloc_frames):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        present(frame())
+        allocated += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return {'fps': round(fps, 1), 'alloc_bytes_per_frame': round(allocated / alloc_frames)}
+
+def compare(results, baseline, margin):
+    """Returns a list of human-readable regressions."""
+    failures = []
+    for name, result in results.items():
+        base = baseline.get('scenarios', {}).get(name)
+        if base is None:
+            continue
+        if result['fps'] < base['fps'] * (1 - margin):
+            failures.append(f"{name}: {result['fps']} fps < baseline {base['fps']} fps - {margin:.0%}")
+        # A small absolute allowance keeps near-zero baselines from flapping
+        limit = base['alloc_bytes_per_frame'] * (1 + margin) + 256
+        if result['alloc_bytes_per_frame'] > limit:
+            failures.append(
+                f"{name}: {result['alloc_bytes_per_frame']} B/frame > baseline "
+                f"{base['alloc_bytes_per_frame']} B/frame + {margin:.0%}"
+            )
+    return failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless frame-rate and allocation benchmarks.")
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--alloc-frames', type=int, default=120)
+    parser.add_argument('--margin', type=float, default=0.2, help="allowed regression as a fraction (default 0.2)")
+    parser.add_argument('--only', nargs='*', choices=sorted(SCENARIOS), help="run a subset of scenarios")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+
+    results = {}
+    for name in args.only or SCENARIOS:
+        results[name] = run_scenario(screen, SCENARIOS[name], args.frames, args.alloc_frames)
+        print(f"{name:12s}{results[name]['fps']:10.1f} fps{results[name]['alloc_bytes_per_frame']:10d} B/frame")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                'machine': f"{platform.system()} {platform.machine()} Python {platform.python_version()}",
+                'pygame': pygame.version.ver,
+                'scenarios': results,
+            }, f, indent=2)
+            f.write('\n')
+        print(f"baseline written to {args.baseline}")
+        sys.exit(0)
+
+    if not os.path.exists(args.baseline):
+        print("no baseline yet; run with --update-baseline")
+        sys.exit(0)
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    failures = compare(results, baseline, args.margin)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,152 @@
+# bundle.py
+#
+# Packs every sprite the game draws, already scaled to the size it is drawn
+# at, as raw RGBA, and every sound effect as PCM in the mixer's format, into
+# one file that is memory-mapped at startup. Loading an asset from it is a
+# buffer wrap instead of a PNG decode or WAV resample.
+#
+#     python bundle.py                 # writes assets.bundle
+#     python bundle.py --out PATH
+#
+# Rebuild the bundle whenever an image, sound or sprite size changes.
+
+import os
+import argparse
+import array
+import json
+import mmap
+import struct
+import pygame
+from game_elements import sprite_manifest
+from drone import DRONE_SPRITE
+from renderer import ui_manifest
+
+# --- File layout (little-endian) ---
+# header: magic, version, index length (u32)
+# index:  JSON with the offset and shape of every image and sound
+# blobs:  RGBA pixel rows and PCM samples, each starting on a 16-byte boundary
+MAGIC = b'DRBN'
+VERSION = 1
+HEADER = struct.Struct('<4sBI')
+BUNDLE_PATH = 'assets.bundle'
+AUDIO_FORMAT = (44100, -16, 2)  # pygame.mixer.init()'s default
+SOUNDS = [
+    'assets/audio/impact.wav',
+    'assets/audio/star_collect.wav',
+    'assets/audio/game_over.wav',
+    'assets/audio/start.wav',
+]
+
+def asset_manifest(width, height):
+    """Returns ([(path, size), ...], [sound path, ...]) for everything the game loads."""
+    images = ui_manifest(width, height) + sprite_manifest() + [DRONE_SPRITE]
+    return images, SOUNDS
+
+def trim_silence(pcm, threshold=64):
+    """Drops the near-silent tail of signed 16-bit PCM, keeping whole stereo frames."""
+    samples = array.array('h', pcm)
+    end = len(samples)
+    while end and abs(samples[end - 1]) <= threshold:
+        end -= 1
+    end += -end % 2
+    return samples[:end].tobytes()
+
+def build_bundle(out_path, images, sounds):
+    """Decodes, scales and writes every asset; missing files are skipped with a warning."""
+    blobs = []
+    index = {'audio_format': AUDIO_FORMAT, 'images': [], 'sounds': []}
+    offset = 0
+
+    def add(data):
+        nonlocal offset
+        start = offset
+        blobs.append(data)
+        padding = -len(data) % 16
+        if padding: blobs.append(bytes(padding))
+        offset += len(data) + padding
+        return start
+
+    for path, size in images:
+        if not os.path.exists(path):
+            print(f"skipping missing image {path}")
+            continue
+        surface = pygame.image.load(path)
+        if size is not None:
+            surface = pygame.transform.scale(surface, size)
+        w, h = surface.get_size()
+        start = add(pygame.image.tobytes(surface, 'RGBA'))
+        index['images'].append([path, size, [w, h], start])
+
+    pygame.mixer.init(*AUDIO_FORMAT)
+    for path in sounds:
+        if not os.path.exists(path):
+            print(f"skipping missing sound {path}")
+            continue
+        pcm = trim_silence(pygame.mixer.Sound(path).get_raw())
+        index['sounds'].append([path, add(pcm), len(pcm)])
+
+    index_bytes = json.dumps(index).encode()
+    # Pad the index so the first blob keeps its 16-byte alignment
+    index_bytes += b' ' * (-(HEADER.size + len(index_bytes)) % 16)
+    with open(out_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(index_bytes)))
+        f.write(index_bytes)
+        for blob in blobs:
+            f.write(blob)
+    return HEADER.size + len(index_bytes) + offset
+
+class AssetBundle:
+    def __init__(self, path):
+        """Memory-maps a bundle; pages are only read in when an asset is first used."""
+        with open(path, 'rb') as f:
+            # Copy-on-write, so surfaces wrapping the map can be drawn on safely
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, version, index_length = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} asset bundle")
+        index = json.loads(self.data[HEADER.size:HEADER.size + index_length])
+        base = HEADER.size + index_length
+        self.view = memoryview(self.data)
+        self.audio_format = tuple(index['audio_format'])
+        self.images = {
+            (path, tuple(size) if size else None): (tuple(dims), base + start)
+            for path, size, dims, start in index['images']
+        }
+        self.sounds = {path: (base + start, length) for path, start, length in index['sounds']}
+
+    def image(self, path, size=None):
+        """Returns a surface over the bundled pixels, or None if the image isn't bundled."""
+        entry = self.images.get((path, size))
+        if entry is None:
+            return None
+        (w, h), start = entry
+        return pygame.image.frombuffer(self.view[start:start + w * h * 4], (w, h), 'RGBA')
+
+    def sound(self, path):
+        """Returns a Sound from the bundled PCM, or None if it isn't bundled in the mixer's format."""
+        entry = self.sounds.get(path)
+        if entry is None or pygame.mixer.get_init() != self.audio_format:
+            return None
+        start, length = entry
+        return pygame.mixer.Sound(buffer=self.view[start:start + length])
+
+def open_bundle(path=BUNDLE_PATH):
+    """Returns the AssetBundle at path, or None if it hasn't been built."""
+    if not os.path.exists(path):
+        return None
+    return AssetBundle(path)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack the game's images and sounds into one pre-decoded file.")
+    parser.add_argument('--out', default=BUNDLE_PATH)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    args = parser.parse_args()
+
+    # Packing never opens a window or plays anything
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    pygame.init()
+    images, sounds = asset_manifest(args.width, args.height)
+    size = build_bundle(args.out, images, sounds)
+    print(f"wrote {args.out}: {size / 1e6:.1f} MB")
@@ -0,0 +1,106 @@
+# collision.py
+
+from bisect import bisect_left
+
+def swept_overlap(box, dx, dy, target):
+    """True if box (left, top, right, bottom) overlaps target at any point while moving by (dx, dy).
+
+    Overlap is strict, as in Rect.colliderect, so with no movement the two agree.
+    """
+    enter, leave = float('-inf'), float('inf')
+    for lo, hi, d, target_lo, target_hi in ((box[0], box[2], dx, target[0], target[2]),
+                                            (box[1], box[3], dy, target[1], target[3])):
+        if d == 0:
+            if hi <= target_lo or lo >= target_hi:
+                return False
+            continue
+        # Fractions of the move at which this axis starts and stops overlapping
+        a = (target_lo - hi) / d
+        b = (target_hi - lo) / d
+        if a > b: a, b = b, a
+        if a > enter: enter = a
+        if b < leave: leave = b
+    return enter < leave and enter < 1 and leave > 0
+
+class CollisionIndex:
+    def __init__(self):
+        """Keeps entity hitboxes in world coordinates, sorted by their left edge.
+
+        Everything scrolls left at the same speed, so a hitbox never moves in
+        world space: it is computed once when the entity spawns, and a query
+        only has to look at the entries whose x-span can reach the query box.
+        """
+        self._lefts = []
+        self._entries = []  # (left, right, boxes, entity), parallel to _lefts
+        self.max_width = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._lefts.clear()
+        self._entries.clear()
+        self.max_width = 0
+
+    def insert(self, entity, rects, offset_x):
+        """Adds an entity whose screen-space hitbox Rects are shifted by offset_x into world space."""
+        boxes = tuple((r.left + offset_x, r.top, r.right + offset_x, r.bottom) for r in rects)
+        left = min(b[0] for b in boxes)
+        right = max(b[2] for b in boxes)
+        self.max_width = max(self.max_width, right - left)
+        i = bisect_left(self._lefts, left)
+        # Keep both lists in step; entries with equal lefts stay in insertion order
+        while i < len(self._lefts) and self._lefts[i] == left:
+            i += 1
+        self._lefts.insert(i, left)
+        self._entries.insert(i, (left, right, boxes, entity))
+
+    def remove(self, entity):
+        """Removes one entity from the index. Culled entities sit near the front, so this is cheap."""
+        for i, entry in enumerate(self._entries):
+            if entry[3] is entity:
+                del self._lefts[i]
+                del self._entries[i]
+                return
+
+    def query(self, left, top, right, bottom):
+        """Returns the entities with a hitbox overlapping the given world-space box."""
+        lefts = self._lefts
+        start = bisect_left(lefts, left - self.max_width)
+        end = bisect_left(lefts, right, start)
+        hits = []
+        for i in range(start, end):
+            entry_left, entry_right, boxes, entity = self._entries[i]
+            if entry_right <= left:
+                continue
+            for b in boxes:
+                # Same strict-overlap rule as Rect.colliderect
+                if b[0] < right and b[2] > left and b[1] < bottom and b[3] > top:
+                    hits.append(entity)
+                    break
+        return hits
+
+    def sweep(self, left, top, right, bottom, dx, dy):
+        """Returns the entities a world-space box touches while moving by (dx, dy) from where it starts.
+
+        Every hitbox is tested against the whole move, so a long step can't
+        carry the box through something thin.
+        """
+        # Bounds of the whole path; only hitboxes inside them get the exact test
+        path_left, path_right = (left + dx, right) if dx < 0 else (left, right + dx)
+        path_top, path_bottom = (top + dy, bottom) if dy < 0 else (top, bottom + dy)
+        lefts = self._lefts
+        start = bisect_left(lefts, path_left - self.max_width)
+        end = bisect_left(lefts, path_right, start)
+        box = (left, top, right, bottom)
+        hits = []
+        for i in range(start, end):
+            entry_left, entry_right, boxes, entity = self._entries[i]
+            if entry_right <= path_left:
+                continue
+            for b in boxes:
+                if (b[0] < path_right and b[2] > path_left and b[1] < path_bottom and b[3] > path_top
+                        and swept_overlap(box, dx, dy, b)):
+                    hits.append(entity)
+                    break
+        return hits
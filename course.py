@@ -0,0 +1,110 @@
+# course.py
+
+import random
+from collections import namedtuple
+from itertools import islice
+from game_elements import THEMES
+
+# --- One obstacle to place in the world ---
+# kind is 'pillar', 'rock' or 'puff'. x is the world x of the screen's right
+# edge when it spawns. y is the top of the gap for pillars and the centre for
+# rocks and puffs; gap_size is 0 for anything but a pillar. variant is the
+# pillar theme or the puff image. star_y is where a star sits in a pillar's
+# gap, or None.
+SpawnEvent = namedtuple('SpawnEvent', 'kind x y gap_size variant star_y')
+
+PUFF_IMAGES = ['puffLarge.png', 'puffSmall.png']
+FIRST_SPAWN = 600        # 120 frames at the base scroll speed
+SPACING = (450, 750)     # 90-150 frames at the base scroll speed
+
+def course_slots(seed, width, height, spacing=SPACING):
+    """Yields the course one slot at a time, forever.
+
+    A slot is a (pillar, rock, puff) triple of SpawnEvents at the same x.
+    Which one actually spawns depends on the score when the camera gets
+    there, so every candidate is drawn up front and the spawn itself never
+    touches the rng.
+    """
+    rng = random.Random(seed)
+    gap_margin = 100
+    star_padding = 40
+    star_countdown = rng.randint(1, 5)
+    x = width + FIRST_SPAWN
+    while True:
+        gap_size = rng.randint(230, 400)
+        theme = rng.choice(THEMES)
+        gap_y = rng.randint(gap_margin, height - gap_margin - gap_size)
+        star_y = None
+        star_countdown -= 1
+        if star_countdown <= 0:
+            star_y = rng.randint(gap_y + star_padding, gap_y + gap_size - star_padding)
+            star_countdown = rng.randint(1, 5)
+        pillar = SpawnEvent('pillar', x, gap_y, gap_size, theme, star_y)
+        rock = SpawnEvent('rock', x, rng.randint(150, height - 250), 0, None, None)
+        puff_image = rng.choice(PUFF_IMAGES)
+        puff = SpawnEvent('puff', x, rng.randint(150, height - 250), 0, puff_image, None)
+        yield pillar, rock, puff
+        x += rng.randint(*spacing)
+
+class Course:
+    def __init__(self, seed, width, height, spacing=SPACING, chunk_size=16, history=256):
+        """Streams seeded spawn events, keeping a chunk of slots computed ahead of the camera.
+
+        Call prefetch() on frames that spawn nothing to top the lookahead up;
+        next_x() and pop() then only read from the buffer. The last `history`
+        consumed slots are kept so restore() can rewind to an earlier snapshot.
+        """
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.history = history
+        self.slots = []
+        self.base = 0  # index of slots[0] in the whole course
+        self.stream = course_slots(seed, width, height, spacing)
+        self.spawned = 0
+        # --- Obstacle mix state ---
+        self.spawn_pillar = True
+        self.obstacle_type_counter = 0
+        self.prefetch()
+
+    def prefetch(self):
+        """Computes the next chunk of slots once fewer than a chunk are buffered."""
+        consumed = self.spawned - self.base
+        if len(self.slots) - consumed < self.chunk_size:
+            if consumed > 2 * self.history:
+                del self.slots[:consumed - self.history]
+                self.base = self.spawned - self.history
+            self.slots.extend(islice(self.stream, self.chunk_size))
+
+    def next_x(self):
+        """World x at which the next obstacle spawns."""
+        if self.spawned - self.base >= len(self.slots):
+            self.prefetch()  # may trim history and move base
+        i = self.spawned - self.base
+        return self.slots[i][0].x
+
+    def pop(self, score):
+        """Returns the next SpawnEvent; the mix gets harder as the score rises."""
+        if self.spawned - self.base >= len(self.slots):
+            self.prefetch()  # may trim history and move base
+        i = self.spawned - self.base
+        pillar, rock, puff = self.slots[i]
+        self.spawned += 1
+        if score < 15:
+            return pillar
+        if score < 30:
+            event = pillar if self.spawn_pillar else rock
+            self.spawn_pillar = not self.spawn_pillar
+            return event
+        event = (pillar, rock, puff)[self.obstacle_type_counter % 3]
+        self.obstacle_type_counter += 1
+        return event
+
+    def snapshot(self):
+        return self.spawned, self.spawn_pillar, self.obstacle_type_counter
+
+    def restore(self, state):
+        """Rewinds (or fast-forwards) to a snapshot; slots already generated are reused."""
+        spawned, self.spawn_pillar, self.obstacle_type_counter = state
+        if spawned < self.base:
+            raise ValueError("snapshot is older than the course history")
+        self.spawned = spawned
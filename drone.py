@@ -3,17 +3,24 @@
 import pygame
 import random
 import math
+from assets import asset_cache
 
 vec = pygame.math.Vector2
+DRONE_SPRITE = ('assets/planeBlue1.png', (60, 45))
 
 class Drone:
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, rotation_step=1, smooth_rotation=False):
         """Initializes the Drone's properties."""
         self.screen_width = screen_width
         self.screen_height = screen_height
-
-        self.image_original = pygame.image.load('assets/planeBlue1.png').convert_alpha()
-        self.image_original = pygame.transform.scale(self.image_original, (60, 45))
+        self.rotation_step = rotation_step
+        self.smooth_rotation = smooth_rotation
+        # Pre-rendered frames, shared through the asset cache
+        self.rotations = asset_cache.get_rotations(*DRONE_SPRITE, rotation_step, 30, smooth_rotation)
+        # Collision always uses unsmoothed 1 degree frames, so the draw settings never change the hitbox
+        self.hit_rotations = asset_cache.get_rotations(*DRONE_SPRITE, 1, 30, False)
+
+        self.image_original = asset_cache.get_image(*DRONE_SPRITE)
         
         self.image = self.image_original.copy()
         self.rect = self.image.get_rect()
@@ -36,35 +43,77 @@ class Drone:
         """Reverses the pendulum's swing to simulate a bounce."""
         self.mass_angular_velocity *= -0.8
 
-    def update(self):
-        """Updates the drone's physics state for one frame."""
+    def update(self, dt=1.0):
+        """Updates the drone's physics state by dt, measured in 1/60 s frames."""
+        # Kept so the renderer can interpolate between the last two steps
+        self.previous_position.update(self.position)
+        self.previous_rotation_angle = self.rotation_angle
+        self.previous_mass_position.update(self.mass_position)
+
         # --- REMOVED self.update_wind() call ---
-        self.update_mass()
+        self.update_mass(dt)
 
         # Update Drone Rotation
         self.rotational_acceleration += self.torque_from_mass
-        self.rotational_velocity += self.rotational_acceleration
-        self.rotation_angle += self.rotational_velocity
-        self.rotational_velocity *= 0.95
+        self.rotational_velocity += self.rotational_acceleration * dt
+        self.rotation_angle += self.rotational_velocity * dt
+        self.rotational_velocity *= 0.95 ** dt
         self.rotation_angle = max(-30, min(self.rotation_angle, 30))
         self.rotational_acceleration = 0
         self.torque_from_mass = 0
 
         # Linear Physics Calculation
+        # Per-frame constants scale with dt: rates multiply, damping factors are raised to the power
         self.apply_force(self.gravity)
-        self.velocity += self.acceleration
-        self.velocity *= self.drag
+        self.velocity.x += self.acceleration.x * dt
+        self.velocity.y += self.acceleration.y * dt
+        self.velocity *= self.drag ** dt
         if abs(self.velocity.y) > self.max_vertical_velocity:
             self.velocity.y = math.copysign(self.max_vertical_velocity, self.velocity.y)
-        self.position += self.velocity
-        self.acceleration = vec(0, 0)
+        self.position.x += self.velocity.x * dt
+        self.position.y += self.velocity.y * dt
+        self.acceleration.update(0, 0)
         self.rect.center = self.position
 
-    def draw(self, screen):
-        """Rotates the image and draws it on the screen."""
-        self.image = pygame.transform.rotate(self.image_original, self.rotation_angle)
-        self.rect = self.image.get_rect(center=self.position)
-        screen.blit(self.image, self.rect)
+    def draw(self, screen, alpha=1.0):
+        """Draws the pre-rendered frame nearest the current angle and returns the area it covered.
+
+        alpha blends from the previous physics step (0) to the latest one (1).
+        """
+        x, y = self.interpolate(self.previous_position, self.position, alpha)
+        angle = self.previous_rotation_angle + (self.rotation_angle - self.previous_rotation_angle) * alpha
+        i = self.rotations.index(angle)
+        half_w, half_h = self.rotations.offsets[i]
+        # Drawing must not touch self.rect: it is the hitbox the simulation collides with
+        return screen.blit(self.rotations.frames[i], (round(x) - half_w, round(y) - half_h))
+
+    def hit_mask(self, alpha=1.0, shift=0.0):
+        """Returns (mask, left, top) for the rotation frame alpha of the way through the last step.
+
+        shift moves the previous position sideways, to carry it into a frame of
+        reference that has scrolled since. alpha=1 is the current frame.
+        """
+        rest = 1.0 - alpha
+        angle = self.rotation_angle + (self.previous_rotation_angle - self.rotation_angle) * rest
+        rotations = self.hit_rotations
+        i = rotations.index(angle)
+        half_w, half_h = rotations.offsets[i]
+        x = self.position.x + (self.previous_position.x + shift - self.position.x) * rest
+        y = self.position.y + (self.previous_position.y - self.position.y) * rest
+        return rotations.masks[i], round(x) - half_w, round(y) - half_h
+
+    def mass_hit_mask(self, alpha=1.0, shift=0.0):
+        """Returns (mask, left, top) for the suspended mass, like hit_mask()."""
+        rest = 1.0 - alpha
+        x = self.mass_position.x + (self.previous_mass_position.x + shift - self.mass_position.x) * rest
+        y = self.mass_position.y + (self.previous_mass_position.y - self.mass_position.y) * rest
+        r = self.mass_radius
+        return asset_cache.get_circle_mask(r), round(x) - r, round(y) - r
+
+    @staticmethod
+    def interpolate(previous, current, alpha):
+        """Returns the (x, y) point alpha of the way from previous to current."""
+        return previous.x + (current.x - previous.x) * alpha, previous.y + (current.y - previous.y) * alpha
         
     def reset(self, screen_width, screen_height):
         """Resets the drone to its initial state."""
@@ -92,24 +141,57 @@ class Drone:
         self.mass_angle = 0
         self.mass_angular_velocity = 0
         self.mass_angular_acceleration = 0
-        self.mass_position = vec(0, 0)
+        # Hanging straight down, so the first interpolated frame doesn't swing in from the origin
+        self.mass_position = vec(self.position.x, self.position.y + self.rope_length)
         
         self.mass_radius = 8
+        self.mass_touching = False  # mass_collide() fires on contact, not on every touching step
+
+        self.previous_position = vec(self.position)
+        self.previous_rotation_angle = self.rotation_angle
+        self.previous_mass_position = vec(self.mass_position)
+
+    def snapshot(self):
+        """Returns the physics state as a flat tuple of numbers."""
+        return (
+            self.position.x, self.position.y, self.velocity.x, self.velocity.y,
+            self.acceleration.x, self.acceleration.y,
+            self.rotation_angle, self.rotational_velocity, self.rotational_acceleration, self.torque_from_mass,
+            self.mass_angle, self.mass_angular_velocity, self.mass_angular_acceleration,
+            self.mass_position.x, self.mass_position.y,
+            self.previous_position.x, self.previous_position.y, self.previous_rotation_angle,
+            self.previous_mass_position.x, self.previous_mass_position.y, self.mass_touching,
+        )
+
+    def restore(self, state):
+        """Puts back a state from snapshot(), updating the vectors in place."""
+        (px, py, vx, vy, ax, ay,
+         self.rotation_angle, self.rotational_velocity, self.rotational_acceleration, self.torque_from_mass,
+         self.mass_angle, self.mass_angular_velocity, self.mass_angular_acceleration,
+         mx, my, ppx, ppy, self.previous_rotation_angle, pmx, pmy, self.mass_touching) = state
+        self.position.update(px, py)
+        self.velocity.update(vx, vy)
+        self.acceleration.update(ax, ay)
+        self.mass_position.update(mx, my)
+        self.previous_position.update(ppx, ppy)
+        self.previous_mass_position.update(pmx, pmy)
+        self.rect.center = self.position
 
     # --- REMOVED update_wind() method ---
     
-    def update_mass(self):
+    def update_mass(self, dt=1.0):
         """Calculates the swing of the suspended mass and its effect on the drone."""
         gravity_pull = -0.02
         self.mass_angular_acceleration = gravity_pull * math.sin(self.mass_angle)
         self.mass_angular_acceleration += (self.acceleration.x * 0.1) * math.cos(self.mass_angle)
-        self.mass_angular_velocity += self.mass_angular_acceleration
-        self.mass_angle += self.mass_angular_velocity
-        self.mass_angular_velocity *= 0.99
+        self.mass_angular_velocity += self.mass_angular_acceleration * dt
+        self.mass_angle += self.mass_angular_velocity * dt
+        self.mass_angular_velocity *= 0.99 ** dt
         
         mass_pull_strength = 0.02
         force_x = self.mass_angle * mass_pull_strength
-        self.apply_force(vec(force_x, 0))
+        # Same as apply_force(vec(force_x, 0)) without allocating a vector every frame
+        self.acceleration.x += force_x / self.mass
         
         torque_strength = 0.008
         self.torque_from_mass = self.mass_angle * torque_strength
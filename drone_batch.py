@@ -0,0 +1,153 @@
+# drone_batch.py
+
+import numpy as np
+from simulation import ACTION_UP, ACTION_DOWN
+
+class DroneBatch:
+    def __init__(self, count, screen_width, screen_height):
+        """Holds the state of `count` drones as NumPy arrays, one row per drone."""
+        self.count = count
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+
+        # --- Same constants as Drone.reset() ---
+        self.mass = 1.0
+        self.gravity = 0.2 * self.mass
+        self.thrust_force = -0.5
+        self.down_thrust_force = 0.3
+        self.drag = 0.985
+        self.max_vertical_velocity = 8
+        self.rope_length = 70
+        self.mass_radius = 8
+        self.width, self.height = 60, 45
+
+        self.reset()
+
+    def reset(self):
+        """Puts every drone back at the starting position with the pendulum at rest."""
+        n = self.count
+        self.position = np.empty((n, 2))
+        self.position[:, 0] = self.screen_width / 4
+        self.position[:, 1] = self.screen_height / 2
+        self.velocity = np.zeros((n, 2))
+        self.rotation_angle = np.zeros(n)
+        self.rotational_velocity = np.zeros(n)
+        self.mass_angle = np.zeros(n)
+        self.mass_angular_velocity = np.zeros(n)
+        self.mass_position = np.zeros((n, 2))
+        self.alive = np.ones(n, dtype=bool)
+
+        # Scratch buffers reused every step so the hot loop does not allocate
+        self._accel = np.zeros((n, 2))
+        self._tmp = np.zeros(n)
+
+    @classmethod
+    def from_drones(cls, drones):
+        """Builds a batch that starts from the current state of scalar Drone objects."""
+        first = drones[0]
+        batch = cls(len(drones), first.screen_width, first.screen_height)
+        for i, d in enumerate(drones):
+            batch.position[i] = (d.position.x, d.position.y)
+            batch.velocity[i] = (d.velocity.x, d.velocity.y)
+            batch.rotation_angle[i] = d.rotation_angle
+            batch.rotational_velocity[i] = d.rotational_velocity
+            batch.mass_angle[i] = d.mass_angle
+            batch.mass_angular_velocity[i] = d.mass_angular_velocity
+            batch.mass_position[i] = (d.mass_position.x, d.mass_position.y)
+        return batch
+
+    def state_arrays(self):
+        """Every array step() changes, one row per drone."""
+        return (
+            self.position, self.velocity, self.rotation_angle, self.rotational_velocity,
+            self.mass_angle, self.mass_angular_velocity, self.mass_position,
+        )
+
+    def step(self, actions, dt=1.0):
+        """Advances every live drone by dt (in 1/60 s frames). `actions` is an int array of ACTION_* bits.
+
+        Crashed drones (alive False) keep their whole state exactly as it was.
+        """
+        actions = np.asarray(actions)
+        dead = ~self.alive
+        # Only copied once something has crashed, so the all-alive path stays allocation-free
+        frozen = [a[dead] for a in self.state_arrays()] if dead.any() else None
+        accel = self._accel
+        accel[:] = 0.0
+
+        # Thrust (Drone.move_up / Drone.move_down)
+        accel[:, 1] += np.where(actions & ACTION_UP, self.thrust_force / self.mass, 0.0)
+        accel[:, 1] += np.where(actions & ACTION_DOWN, self.down_thrust_force / self.mass, 0.0)
+
+        # Pendulum (Drone.update_mass), driven by the acceleration before the pull is added
+        sin_a = np.sin(self.mass_angle)
+        cos_a = np.cos(self.mass_angle)
+        mass_angular_acceleration = -0.02 * sin_a + (accel[:, 0] * 0.1) * cos_a
+        self.mass_angular_velocity += mass_angular_acceleration * dt
+        self.mass_angle += self.mass_angular_velocity * dt
+        self.mass_angular_velocity *= 0.99 ** dt
+        accel[:, 0] += self.mass_angle * 0.02 / self.mass
+        torque_from_mass = self.mass_angle * 0.008
+
+        np.sin(self.mass_angle, out=self._tmp)
+        self.mass_position[:, 0] = self.position[:, 0] + self.rope_length * self._tmp
+        np.cos(self.mass_angle, out=self._tmp)
+        self.mass_position[:, 1] = self.position[:, 1] + self.rope_length * self._tmp
+
+        # Rotation
+        self.rotational_velocity += torque_from_mass * dt
+        self.rotation_angle += self.rotational_velocity * dt
+        self.rotational_velocity *= 0.95 ** dt
+        np.clip(self.rotation_angle, -30, 30, out=self.rotation_angle)
+
+        # Linear physics
+        accel[:, 1] += self.gravity / self.mass
+        accel *= dt
+        self.velocity += accel
+        self.velocity *= self.drag ** dt
+        np.clip(self.velocity[:, 1], -self.max_vertical_velocity, self.max_vertical_velocity, out=self.velocity[:, 1])
+        np.multiply(self.velocity, dt, out=accel)  # accel is spent; reuse it for the displacement
+        self.position += accel
+
+        if frozen is not None:
+            for array, rows in zip(self.state_arrays(), frozen):
+                array[dead] = rows
+
+    def check_crashes(self, ground_y):
+        """Marks live drones that touch the ceiling or the ground as crashed, as Simulation does.
+
+        ground_y is the simulation's ground_y. Returns a boolean array of the
+        drones that crashed on this call; obstacles are left to the caller.
+        """
+        left, top, right, bottom = self.rect_bounds()
+        crashed = self.alive & ((top <= 0) | (bottom >= ground_y + 10))
+        self.alive &= ~crashed
+        return crashed
+
+    def mass_collide(self, mask):
+        """Bounces the pendulum of every live drone selected by the boolean `mask`."""
+        self.mass_angular_velocity[mask & self.alive] *= -0.8
+
+    def rect_bounds(self):
+        """Returns (left, top, right, bottom) int arrays matching Drone.rect for each drone."""
+        # pygame rounds a float center half away from zero
+        center = np.sign(self.position) * np.floor(np.abs(self.position) + 0.5)
+        left = center[:, 0].astype(np.int64) - self.width // 2
+        top = center[:, 1].astype(np.int64) - self.height // 2
+        return left, top, left + self.width, top + self.height
+
+    def max_error(self, drones):
+        """Largest absolute difference between this batch and matching scalar Drones."""
+        error = 0.0
+        for i, d in enumerate(drones):
+            error = max(
+                error,
+                abs(self.position[i, 0] - d.position.x),
+                abs(self.position[i, 1] - d.position.y),
+                abs(self.velocity[i, 0] - d.velocity.x),
+                abs(self.velocity[i, 1] - d.velocity.y),
+                abs(self.rotation_angle[i] - d.rotation_angle),
+                abs(self.mass_angle[i] - d.mass_angle),
+                abs(self.mass_angular_velocity[i] - d.mass_angular_velocity),
+            )
+        return error
@@ -1,129 +1,254 @@
 import pygame
-import random
+from assets import asset_cache
+from text import text_cache
+
+# --- Every sprite the entities can ask for, as (path, size) pairs ---
+THEMES = ['rock', 'rockGrass', 'rockIce', 'rockSnow']
+PILLAR_WIDTH = 80
+CAP_HEIGHT = 60
+
+def sprite_manifest():
+    """Lists every (path, size) pair the entity classes borrow from the asset cache."""
+    cap_size = (PILLAR_WIDTH + 20, CAP_HEIGHT)
+    entries = []
+    for theme in THEMES:
+        entries.append((f'assets/{theme}Down.png', cap_size))
+        entries.append((f'assets/{theme}.png', cap_size))
+    entries.append(('assets/starGold.png', (35, 35)))
+    entries.append(('assets/rock.png', (100, 100)))
+    entries.append(('assets/puffLarge.png', (80, 80)))
+    entries.append(('assets/puffSmall.png', (50, 50)))
+    return entries
+
+class Obstacle:
+    __slots__ = (
+        'screen_width', 'screen_height', 'gap_size', 'width', 'image_top', 'image_bottom',
+        'world_x', 'gap_y', 'top_rect', 'bottom_rect', 'top_cap_rect', 'bottom_cap_rect',
+        'hitboxes', 'passed', 'event', 'spawn_scroll_x', 'mask_top', 'mask_bottom', 'body_mask',
+        'body_image',
+    )
+    body_color = (94, 73, 52)
 
-class Obstacle:  
     def __init__(self, screen_width, screen_height):
-        """Initializes the Obstacle's properties (pillars)."""
+        """Allocates a blank pillar; spawn() fills it in, so pooled instances can be reused."""
         self.screen_width = screen_width
         self.screen_height = screen_height
+        self.width = PILLAR_WIDTH
+        self.top_rect = pygame.Rect(0, 0, 0, 0)
+        self.bottom_rect = pygame.Rect(0, 0, 0, 0)
+        self.top_cap_rect = pygame.Rect(0, 0, 0, 0)
+        self.bottom_cap_rect = pygame.Rect(0, 0, 0, 0)
+        self.hitboxes = [pygame.Rect(0, 0, 0, 0) for _ in range(4)]
+        # Covers a body of any height: a solid strip as tall as the screen, anchored at its open end
+        self.body_mask = asset_cache.get_solid_mask((self.width, screen_height))
+        # Drawn the same way: SDL's fill slows down several times over at some x alignments, a blit doesn't
+        self.body_image = asset_cache.get_solid_surface((self.width, screen_height), self.body_color)
 
-        # --- UPDATED: Wider range for more variety, slightly smaller minimum ---
-        self.gap_size = random.randint(230, 400)
-        self.speed = 5
-        self.width = 80
-        self.body_color = (94, 73, 52) 
+    def spawn(self, event, scroll_x):
+        """Initializes the Obstacle's properties (pillars) from a course SpawnEvent."""
+        self.event = event
+        self.spawn_scroll_x = scroll_x
+        self.gap_size = event.gap_size
 
-        themes = ['rock', 'rockGrass', 'rockIce', 'rockSnow']
-        chosen_theme = random.choice(themes)
-        top_image_path = f'assets/{chosen_theme}Down.png'
-        bottom_image_path = f'assets/{chosen_theme}.png'
+        top_image_path = f'assets/{event.variant}Down.png'
+        bottom_image_path = f'assets/{event.variant}.png'
 
-        image_top_original = pygame.image.load(top_image_path).convert_alpha()
-        image_bottom_original = pygame.image.load(bottom_image_path).convert_alpha()
-        
-        # Scaling the cap images to a consistent size
-        cap_height = 60 
-        self.image_top = pygame.transform.scale(image_top_original, (self.width + 20, cap_height))
-        self.image_bottom = pygame.transform.scale(image_bottom_original, (self.width + 20, cap_height))
+        # Cap images are shared, pre-scaled surfaces from the asset cache
+        cap_size = (self.width + 20, CAP_HEIGHT)
+        self.image_top = asset_cache.get_image(top_image_path, cap_size)
+        self.image_bottom = asset_cache.get_image(bottom_image_path, cap_size)
+        self.mask_top = asset_cache.get_mask(top_image_path, cap_size)
+        self.mask_bottom = asset_cache.get_mask(bottom_image_path, cap_size)
 
-        self.x = self.screen_width
-        gap_margin = 100
-        self.gap_y = random.randint(gap_margin, self.screen_height - gap_margin - self.gap_size)
+        self.world_x = event.x
+        x = event.x - scroll_x
+        self.gap_y = event.y
 
-        self.top_rect = pygame.Rect(self.x, 0, self.width, self.gap_y)
-        self.bottom_rect = pygame.Rect(self.x, self.gap_y + self.gap_size, self.width, self.screen_height)
-        
-        self.top_cap_rect = self.image_top.get_rect(midtop=self.top_rect.midbottom)
-        self.bottom_cap_rect = self.image_bottom.get_rect(midbottom=self.bottom_rect.midtop)
+        self.top_rect.update(x, 0, self.width, self.gap_y)
+        self.bottom_rect.update(x, self.gap_y + self.gap_size, self.width, self.screen_height)
+
+        self.top_cap_rect.size = cap_size
+        self.bottom_cap_rect.size = cap_size
+        self.top_cap_rect.midtop = self.top_rect.midbottom
+        self.bottom_cap_rect.midbottom = self.bottom_rect.midtop
+
+        # Bounding boxes for the collision index's prefilter; the masks decide actual hits
+        parts = (self.top_rect, self.bottom_rect, self.top_cap_rect, self.bottom_cap_rect)
+        for hitbox, part in zip(self.hitboxes, parts):
+            hitbox.update(part)
 
         self.passed = False
 
-    def update(self):
-        """Moves the entire obstacle assembly from right to left."""
-        self.x -= self.speed
+    def update(self, scroll_x):
+        """Places the entire obstacle assembly at its world position minus the scroll."""
+        x = self.world_x - scroll_x
         # Update the main pillar bodies
-        self.top_rect.x = self.x
-        self.bottom_rect.x = self.x
+        self.top_rect.x = x
+        self.bottom_rect.x = x
         
         # --- FIXED: Update cap positions relative to the bodies ---
         # This ensures they are always perfectly aligned for collision detection
         self.top_cap_rect.midtop = self.top_rect.midbottom
         self.bottom_cap_rect.midbottom = self.bottom_rect.midtop
 
-    def draw(self, screen):
-        pygame.draw.rect(screen, self.body_color, self.top_rect)
-        pygame.draw.rect(screen, self.body_color, self.bottom_rect)
-        screen.blit(self.image_top, self.top_cap_rect)
-        screen.blit(self.image_bottom, self.bottom_cap_rect)
+    def right(self):
+        return self.top_rect.right
+
+    def overlaps_mask(self, mask, x, y):
+        """True if `mask`, placed at screen (x, y), touches the bodies or the opaque part of a cap."""
+        body = self.body_mask
+        top, bottom = self.top_rect, self.bottom_rect
+        top_cap, bottom_cap = self.top_cap_rect, self.bottom_cap_rect
+        return bool(
+            mask.overlap(body, (top.x - x, top.bottom - self.screen_height - y))
+            or mask.overlap(body, (bottom.x - x, bottom.y - y))
+            or mask.overlap(self.mask_top, (top_cap.x - x, top_cap.y - y))
+            or mask.overlap(self.mask_bottom, (bottom_cap.x - x, bottom_cap.y - y))
+        )
+
+    def draw(self, screen, x):
+        """Draws the pillar with its bodies' left edge at screen x and returns the area it touched.
+
+        The rects are left where the last update() put them, for the simulation.
+        """
+        top, bottom = self.top_rect, self.bottom_rect
+        top_cap, bottom_cap = self.top_cap_rect, self.bottom_cap_rect
+        cap_x = x + top_cap.x - top.x
+        area = screen.blit(self.body_image, (x, top.bottom - self.screen_height))
+        area.union_ip(screen.blit(self.body_image, (x, bottom.y)))
+        area.union_ip(screen.blit(self.image_top, (cap_x, top_cap.y)))
+        area.union_ip(screen.blit(self.image_bottom, (cap_x, bottom_cap.y)))
+        return area
 
 class Scoreboard:
     def __init__(self, screen_width):
         self.score = 0
         self.star_count = 0
-        self.font = pygame.font.Font(None, 50)
+        self.font_size = 50
         self.color = (255, 255, 255)
         self.position = (screen_width / 2, 30)
+        # Last rendered score; the text is only looked up again when it changes
+        self.rendered_score = None
+        self.text_surface = None
+        self.text_rect = None
     def increase_score(self):
         self.score += 1
     def increase_star_count(self):
         self.star_count += 1
     def draw(self, screen):
-        score_text = f"Score: {self.score}"
-        text_surface = self.font.render(score_text, True, self.color)
-        text_rect = text_surface.get_rect(center=self.position)
-        screen.blit(text_surface, text_rect)
+        if self.score != self.rendered_score:
+            score_text = f"Score: {self.score}"
+            self.text_surface = text_cache.render(score_text, self.font_size, self.color)
+            self.text_rect = self.text_surface.get_rect(center=self.position)
+            self.rendered_score = self.score
+        return screen.blit(self.text_surface, self.text_rect)
 
 class Star:
-    def __init__(self, x, y, speed):
-        self.image_original = pygame.image.load('assets/starGold.png').convert_alpha()
-        self.image = pygame.transform.scale(self.image_original, (35, 35))
-        self.rect = self.image.get_rect(center=(x, y))
-        self.speed = speed
-    def update(self):
-        self.rect.x -= self.speed
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
+    __slots__ = ('image', 'rect', 'world_x', 'hitboxes', 'event', 'spawn_scroll_x')
+
+    def __init__(self, screen_width, screen_height):
+        """Allocates a blank star; spawn() places it."""
+        self.image = asset_cache.get_image('assets/starGold.png', (35, 35))
+        self.rect = self.image.get_rect()
+        self.hitboxes = [self.rect.copy()]
+    def spawn(self, event, scroll_x):
+        """Centres the star in the gap of the pillar spawned by `event`."""
+        self.event = event
+        self.spawn_scroll_x = scroll_x
+        self.rect.center = (event.x + 100 - scroll_x, event.star_y)
+        self.world_x = self.rect.x + scroll_x
+        self.hitboxes[0].update(self.rect)
+    def update(self, scroll_x):
+        self.rect.x = self.world_x - scroll_x
+    def right(self):
+        return self.rect.right
+    def draw(self, screen, x):
+        return screen.blit(self.image, (x, self.rect.y))
 
 class FloatingRock:
-    def __init__(self, screen_width, screen_height, speed):
+    __slots__ = ('screen_width', 'screen_height', 'image', 'mask', 'rect', 'world_x', 'hitboxes', 'event', 'spawn_scroll_x')
+
+    def __init__(self, screen_width, screen_height):
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.speed = speed
-        self.image_original = pygame.image.load('assets/rock.png').convert_alpha()
-        self.image = pygame.transform.scale(self.image_original, (100, 100))
-        self.rect = self.image.get_rect(
-            center=(screen_width + 100, random.randint(150, screen_height - 250))
-        )
-    def update(self):
-        self.rect.x -= self.speed
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
+        self.image = asset_cache.get_image('assets/rock.png', (100, 100))
+        self.mask = asset_cache.get_mask('assets/rock.png', (100, 100))
+        self.rect = self.image.get_rect()
+        self.hitboxes = [self.rect.copy()]
+    def spawn(self, event, scroll_x):
+        self.event = event
+        self.spawn_scroll_x = scroll_x
+        self.rect.center = (event.x + 100 - scroll_x, event.y)
+        self.world_x = self.rect.x + scroll_x
+        self.hitboxes[0].update(self.rect)
+    def update(self, scroll_x):
+        self.rect.x = self.world_x - scroll_x
+    def right(self):
+        return self.rect.right
+    def overlaps_mask(self, mask, x, y):
+        """True if `mask`, placed at screen (x, y), touches an opaque pixel of this sprite."""
+        return mask.overlap(self.mask, (self.rect.x - x, self.rect.y - y)) is not None
+    def draw(self, screen, x):
+        return screen.blit(self.image, (x, self.rect.y))
 
 # --- NEW PUFF CLASS ---
 class Puff:
-    def __init__(self, screen_width, screen_height, speed):
-        """Initiav lizes a new puff obstacle."""
-        self.speed = speed
-        
-        # Randomly choose between the large and small puff image
-        puff_choice = random.choice(['puffLarge.png', 'puffSmall.png'])
-        self.image_original = pygame.image.load(f'assets/{puff_choice}').convert_alpha()
-        
-        # Scale the image based on which one was chosen
-        if puff_choice == 'puffLarge.png':
-            self.image = pygame.transform.scale(self.image_original, (80, 80))
-        else:
-            self.image = pygame.transform.scale(self.image_original, (50, 50))
-
-        # Position it randomly in the vertical center of the screen
-        self.rect = self.image.get_rect(
-            center=(screen_width + 100, random.randint(150, screen_height - 250))
-        )
+    __slots__ = ('screen_width', 'screen_height', 'image', 'mask', 'rect', 'world_x', 'hitboxes', 'event', 'spawn_scroll_x')
 
-    def update(self):
-        """Moves the puff from right to left."""
-        self.rect.x -= self.speed
-    
-    def draw(self, screen):
-        """Draws the puff on the screen."""
-        screen.blit(self.image, self.rect)
\ No newline at end of file
+    def __init__(self, screen_width, screen_height):
+        """Allocates a blank puff; spawn() picks its size and position."""
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.hitboxes = [pygame.Rect(0, 0, 0, 0)]
+
+    def spawn(self, event, scroll_x):
+        """Initializes a new puff obstacle from a course SpawnEvent."""
+        self.event = event
+        self.spawn_scroll_x = scroll_x
+        # Size depends on which puff image the course picked
+        size = (80, 80) if event.variant == 'puffLarge.png' else (50, 50)
+        self.image = asset_cache.get_image(f'assets/{event.variant}', size)
+        self.mask = asset_cache.get_mask(f'assets/{event.variant}', size)
+
+        self.rect.size = self.image.get_size()
+        self.rect.center = (event.x + 100 - scroll_x, event.y)
+        self.world_x = self.rect.x + scroll_x
+        self.hitboxes[0].update(self.rect)
+
+    def update(self, scroll_x):
+        """Places the puff at its world position minus the scroll."""
+        self.rect.x = self.world_x - scroll_x
+
+    def right(self):
+        return self.rect.right
+
+    def overlaps_mask(self, mask, x, y):
+        """True if `mask`, placed at screen (x, y), touches an opaque pixel of this sprite."""
+        return mask.overlap(self.mask, (self.rect.x - x, self.rect.y - y)) is not None
+
+    def draw(self, screen, x):
+        """Draws the puff on the screen with its left edge at x."""
+        return screen.blit(self.image, (x, self.rect.y))
+
+class EntityPool:
+    def __init__(self, screen_width, screen_height):
+        """Recycles off-screen entities so long sessions don't allocate new ones every spawn."""
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self._free = {}
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, cls):
+        """Returns a recycled instance of cls if one is free, otherwise a new blank one."""
+        free = self._free.get(cls)
+        if free:
+            self.reused += 1
+            return free.pop()
+        self.created += 1
+        return cls(self.screen_width, self.screen_height)
+
+    def release(self, entity):
+        """Hands an entity back once it is no longer live."""
+        self._free.setdefault(type(entity), []).append(entity)
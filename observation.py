@@ -0,0 +1,155 @@
+# observation.py
+#
+# Observations for learning agents: the rendered frame as NumPy views of the
+# surface's own pixels, grayscale or downsampled frames written into
+# caller-owned (batch) arrays, and a compact feature vector read straight
+# from the simulation. Needs NumPy (pip install numpy).
+
+from contextlib import contextmanager
+import numpy as np
+import pygame
+from renderer import SceneRenderer
+
+# --- Feature vector layout ---
+DRONE_FEATURES = (
+    'x', 'y', 'vx', 'vy', 'rotation', 'rotational_velocity',
+    'mass_angle', 'mass_angular_velocity', 'wind_strength',
+)
+# Per upcoming obstacle: dx from the drone to its left edge, then a vertical
+# span. open is 1 when the span is a pillar gap to fly through and 0 when it
+# is a rock or puff to fly around.
+GAP_FEATURES = ('dx', 'top', 'bottom', 'open')
+LUMA = (77, 150, 29)  # BT.601 weights in 1/256ths, so the sum fits in uint16
+
+def feature_names(gaps=3):
+    """Names of the entries of features(sim, gaps), in order."""
+    names = list(DRONE_FEATURES)
+    for i in range(gaps):
+        names += [f'gap{i}_{name}' for name in GAP_FEATURES]
+    return names
+
+def features(sim, gaps=3, out=None):
+    """Returns a float32 vector of the drone, its pendulum, the wind and the next `gaps` obstacles.
+
+    Obstacles still ahead of the drone are listed in the order it reaches
+    them. Missing ones read as an open gap the height of the screen, a screen
+    width away. Pass out (a row of a batch, say) to avoid allocating.
+    """
+    if out is None:
+        out = np.empty(len(DRONE_FEATURES) + gaps * len(GAP_FEATURES), np.float32)
+    player = sim.player
+    out[:len(DRONE_FEATURES)] = (
+        player.position.x, player.position.y, player.velocity.x, player.velocity.y,
+        player.rotation_angle, player.rotational_velocity,
+        player.mass_angle, player.mass_angular_velocity, sim.wind_strength,
+    )
+    i = len(DRONE_FEATURES)
+    end = len(out)
+    left = player.rect.left
+    for o in sim.obstacles:
+        if i == end:
+            break
+        if o.right() <= left:
+            continue
+        dx = o.world_x - sim.scroll_x - player.position.x
+        if o.event.kind == 'pillar':
+            out[i:i + 4] = (dx, o.gap_y, o.gap_y + o.gap_size, 1.0)
+        else:
+            out[i:i + 4] = (dx, o.rect.top, o.rect.bottom, 0.0)
+        i += 4
+    while i < end:
+        out[i:i + 4] = (sim.width, 0.0, sim.height, 1.0)
+        i += 4
+    return out
+
+def features_batch(sims, gaps=3, out=None):
+    """Fills out[i] with features(sims[i]); allocates (len(sims), n) float32 if out is None."""
+    if out is None:
+        out = np.empty((len(sims), len(DRONE_FEATURES) + gaps * len(GAP_FEATURES)), np.float32)
+    for sim, row in zip(sims, out):
+        features(sim, gaps, row)
+    return out
+
+class FrameView:
+    __slots__ = ('rgb', 'alpha')
+
+    def __init__(self, rgb, alpha):
+        """Arrays over a locked surface's pixels; pixels() clears them when its block ends."""
+        self.rgb = rgb
+        self.alpha = alpha
+
+class FrameObserver:
+    def __init__(self, sim, factor=8, stride=1, grayscale=True):
+        """Renders sim offscreen at 1/factor of its size and reads the frames as arrays.
+
+        factor is SceneRenderer's render scale, so the scene is drawn small
+        to begin with; stride then keeps every stride-th pixel of that for a
+        smaller observation still. Needs a display mode, like any
+        SceneRenderer; SDL_VIDEODRIVER=dummy works without a window.
+        """
+        self.sim = sim
+        self.renderer = SceneRenderer(None, sim, 'full', factor)
+        self.renderer.preload()
+        self.stride = stride
+        self.grayscale = grayscale
+        w, h = self.renderer.screen.get_size()
+        self.width = len(range(0, w, stride))
+        self.height = len(range(0, h, stride))
+        self.shape = (self.height, self.width) if grayscale else (self.height, self.width, 3)
+        # Scratch for the integer luma sum, in the surface's (x, y) order
+        self._luma = np.empty((self.width, self.height), np.uint16)
+        self._channel = np.empty_like(self._luma)
+
+    @contextmanager
+    def pixels(self):
+        """Renders the sim and yields a FrameView of the frame's own pixels, in pygame's (x, y) order.
+
+        Nothing is copied: rgb is surfarray.pixels3d() of the offscreen
+        surface, and alpha is pixels_alpha() if it has per-pixel alpha (the
+        composited scene doesn't, so it is None). The surface is locked
+        while they exist, so they are dropped when the block ends; copy
+        anything that has to outlive it.
+        """
+        # The backdrop is left where it is, so a frame depends only on the sim's state
+        self.renderer.draw_frame("PLAYING", elapsed=0.0)
+        surface = self.renderer.screen
+        alpha = pygame.surfarray.pixels_alpha(surface) if surface.get_flags() & pygame.SRCALPHA else None
+        view = FrameView(pygame.surfarray.pixels3d(surface), alpha)
+        try:
+            yield view
+        finally:
+            # Unlocks the surface so the next frame can be drawn
+            view.rgb = view.alpha = None
+
+    def observe(self, out=None):
+        """Renders the sim and returns uint8 (height, width) grayscale or (height, width, 3) RGB.
+
+        Written into out if it is given, such as a row of a batch array.
+        """
+        if out is None:
+            out = np.empty(self.shape, np.uint8)
+        with self.pixels() as frame:
+            rgb = frame.rgb[::self.stride, ::self.stride]
+            if self.grayscale:
+                luma, channel = self._luma, self._channel
+                np.multiply(rgb[..., 0], LUMA[0], out=luma, dtype=np.uint16)
+                np.multiply(rgb[..., 1], LUMA[1], out=channel, dtype=np.uint16)
+                luma += channel
+                np.multiply(rgb[..., 2], LUMA[2], out=channel, dtype=np.uint16)
+                luma += channel
+                luma >>= 8
+                out[...] = luma.T
+            else:
+                # Channel by channel is several times faster than one transposed copy of all three
+                for c in range(3):
+                    np.copyto(out[..., c], rgb[..., c].T)
+            del rgb
+        return out
+
+def observe_batch(observers, out=None):
+    """Fills out[i] with observers[i].observe(); allocates (len(observers),) + shape uint8 if out is None."""
+    if out is None:
+        out = np.empty((len(observers),) + observers[0].shape, np.uint8)
+    for observer, row in zip(observers, out):
+        observer.observe(row)
+    return out
@@ -0,0 +1,148 @@
+# profiler.py
+
+import csv
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from text import text_cache
+
+class FrameProfiler:
+    def __init__(self, window=300, budget_ms=1000 / 60, max_trace_frames=36000):
+        """Times named phases of each frame with perf_counter_ns.
+
+        Call begin_frame() at the top of the loop, mark(name) after each
+        phase and end_frame() at the bottom. Every call returns straight away
+        while the profiler is disabled, so it can stay wired into the loop.
+        """
+        self.enabled = False
+        self.overlay_visible = False
+        self.tracing = False
+        self.window = window
+        self.budget_ns = int(budget_ms * 1_000_000)
+        self.max_trace_frames = max_trace_frames
+
+        self.samples = {}  # phase -> deque of recent durations in ns
+        self.frame_times = deque(maxlen=window)
+        self.frame_count = 0
+        self.dropped_frames = 0
+        self.trace = []  # (frame, phase, start_ns, duration_ns)
+        self.trace_frames = 0
+        self._frame_start = 0
+        self._last = 0
+        self._overlay_rows = []
+
+    def enable(self, tracing=False):
+        self.enabled = True
+        self.tracing = tracing
+
+    def disable(self):
+        self.enabled = False
+        self.overlay_visible = False
+        # A later enable() must not measure from this frame's timestamps
+        self._frame_start = self._last = 0
+
+    def toggle_overlay(self):
+        """Shows or hides the on-screen overlay, enabling profiling if needed.
+
+        Enabled mid-frame, timing starts at the next begin_frame(): marks
+        before then have no frame start to measure from and are skipped.
+        """
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self.enabled = True
+
+    @contextmanager
+    def suspended(self):
+        """Ignores marks inside the block, e.g. from simulation steps an autopilot rolls back."""
+        enabled = self.enabled
+        self.enabled = False
+        try:
+            yield
+        finally:
+            self.enabled = enabled
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._frame_start = self._last = time.perf_counter_ns()
+
+    def mark(self, phase):
+        """Attributes the time since the previous mark (or frame start) to phase."""
+        if not self.enabled or not self._frame_start:
+            return
+        now = time.perf_counter_ns()
+        duration = now - self._last
+        samples = self.samples.get(phase)
+        if samples is None:
+            samples = self.samples[phase] = deque(maxlen=self.window)
+        samples.append(duration)
+        if self.tracing and self.trace_frames < self.max_trace_frames:
+            self.trace.append((self.frame_count, phase, self._last, duration))
+        self._last = now
+
+    def end_frame(self):
+        if not self.enabled or not self._frame_start:
+            return
+        frame_time = time.perf_counter_ns() - self._frame_start
+        self.frame_times.append(frame_time)
+        # A frame that overruns its budget by half has missed its slot
+        if frame_time > self.budget_ns * 1.5:
+            self.dropped_frames += 1
+        self.frame_count += 1
+        if self.tracing:
+            self.trace_frames += 1
+        if self.overlay_visible and self.frame_count % 30 == 0:
+            self._overlay_rows = self.summary_rows()
+
+    def percentiles(self, phase):
+        """Returns (p50, p99) in milliseconds over the rolling window."""
+        samples = self.frame_times if phase == 'frame' else self.samples.get(phase)
+        if not samples:
+            return 0.0, 0.0
+        ordered = sorted(samples)
+        p50 = ordered[len(ordered) // 2]
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        return p50 / 1e6, p99 / 1e6
+
+    def summary_rows(self):
+        """Rows of (phase, p50, p99) text for the overlay, ending with the dropped-frame count."""
+        rows = [('phase', 'p50 ms', 'p99 ms')]
+        for phase in list(self.samples) + ['frame']:
+            p50, p99 = self.percentiles(phase)
+            rows.append((phase, f"{p50:.2f}", f"{p99:.2f}"))
+        rows.append(('dropped', str(self.dropped_frames), f"/ {self.frame_count}"))
+        return rows
+
+    def draw_overlay(self, screen, position=(10, 10)):
+        """Draws the rolling p50/p99 table and returns the area it covered."""
+        x, y = position
+        columns = (0, 110, 180)
+        area = None
+        for row in self._overlay_rows:
+            for offset, cell in zip(columns, row):
+                surface = text_cache.render(cell, 22, (255, 255, 0))
+                rect = screen.blit(surface, (x + offset, y))
+                area = rect if area is None else area.union(rect)
+            y += 18
+        return area
+
+    def export(self, path):
+        """Writes the trace as Chrome trace JSON (.json) or one row per phase sample (.csv)."""
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['frame', 'phase', 'start_us', 'duration_us'])
+                for frame, phase, start, duration in self.trace:
+                    writer.writerow([frame, phase, start / 1000, duration / 1000])
+        else:
+            events = [
+                {'name': phase, 'ph': 'X', 'ts': start / 1000, 'dur': duration / 1000,
+                 'pid': 1, 'tid': 1, 'args': {'frame': frame}}
+                for frame, phase, start, duration in self.trace
+            ]
+            with open(path, 'w') as f:
+                json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+# --- Shared instance the game loop, simulation and renderer report to ---
+profiler = FrameProfiler()
@@ -0,0 +1,333 @@
+# renderer.py
+
+import pygame
+import math
+import weakref
+from game_elements import Scoreboard, Obstacle, PILLAR_WIDTH, sprite_manifest
+from assets import asset_cache
+from text import text_cache
+from profiler import profiler
+
+WHITE = (255, 255, 255)
+RENDER_MODES = ('full', 'dirty')
+GET_READY = 'assets/textGetReady.png'
+GAME_OVER = 'assets/textGameOver.png'
+UI_BACKGROUND = 'assets/UIbg.png'
+MEDALS = ('assets/medalBronze.png', 'assets/medalSilver.png', 'assets/medalGold.png')
+STAR_ICON = ('assets/starGold.png', (40, 40))
+
+def ui_manifest(width, height):
+    """Lists every (path, size) pair the renderer draws, with the backdrop first."""
+    entries = [('assets/background.png', (width, height)), ('assets/groundSnow.png', None), (GET_READY, None)]
+    entries += [(GAME_OVER, None), (UI_BACKGROUND, None), STAR_ICON]
+    entries += [(medal, None) for medal in MEDALS]
+    return entries
+
+def draw_mass(screen, player, alpha=1.0, factor=1):
+    """Draws the rope and suspended mass, returning the area they cover.
+
+    factor is how many window pixels one pixel of screen covers.
+    """
+    rope_color = (180, 180, 180)
+    mass_color = (200, 50, 50)
+    mass_radius = 8
+    ax, ay = player.interpolate(player.previous_position, player.position, alpha)
+    mx, my = player.interpolate(player.previous_mass_position, player.mass_position, alpha)
+    anchor = (ax / factor, ay / factor)
+    mass = (mx / factor, my / factor)
+    area = pygame.draw.line(screen, rope_color, anchor, mass, max(1, 2 // factor))
+    area.union_ip(pygame.draw.circle(screen, mass_color, mass, max(1, mass_radius // factor)))
+    return area
+
+class ScaledCanvas:
+    def __init__(self, surface, factor):
+        """Lets sprites placed in window coordinates draw on a surface `factor` times smaller.
+
+        Supports the one call the entities and UI draw with, blit(). Each
+        source surface is shrunk once, by preload() or on first use, and the
+        copy is dropped when the source is garbage collected.
+        """
+        self.surface = surface
+        self.factor = factor
+        self._scaled = weakref.WeakKeyDictionary()
+
+    def scaled(self, image):
+        small = self._scaled.get(image)
+        if small is None:
+            w, h = image.get_size()
+            size = (max(1, w // self.factor), max(1, h // self.factor))
+            # smoothscale only takes 24 and 32 bit surfaces
+            if image.get_bitsize() >= 24:
+                small = pygame.transform.smoothscale(image, size)
+            else:
+                small = pygame.transform.scale(image, size)
+            self._scaled[image] = small
+        return small
+
+    def preload(self, images):
+        """Shrinks a list of surfaces up front so drawing them later never has to."""
+        for image in images:
+            self.scaled(image)
+
+    def blit(self, image, dest):
+        k = self.factor
+        return self.surface.blit(self.scaled(image), (int(dest[0]) // k, int(dest[1]) // k))
+
+class SceneRenderer:
+    def __init__(self, screen, sim, mode='full', factor=1):
+        """Draws the simulation and UI to the screen.
+
+        'full' mode redraws the scrolling background and ground every frame
+        and updates the whole display. 'dirty' mode draws from a backdrop
+        pre-composited once (background plus a wide strip of ground tiles),
+        keeps the sky still, and only returns the rectangles that changed:
+        the ground band, the moving sprites and the HUD.
+
+        factor > 1 draws the whole scene to an offscreen surface `factor`
+        times smaller than the window, with every sprite shrunk to match, and
+        scales it up to the window once per frame. The window size must be a
+        multiple of factor so every pixel scales by the same whole number.
+
+        screen may be None to draw offscreen only, at the sim's size scaled
+        down by factor; such a renderer has draw_frame() but not render().
+        """
+        window_width, window_height = screen.get_size() if screen is not None else (sim.width, sim.height)
+        if factor < 1 or window_width % factor or window_height % factor:
+            raise ValueError(f"{window_width}x{window_height} can't be scaled down by {factor}")
+        self.window = screen
+        self.factor = factor
+        self.sim = sim
+        # World and UI positions are in window coordinates; canvas maps them onto screen
+        self.world_width, self.world_height = window_width, window_height
+        if factor == 1:
+            self.screen = screen if screen is not None else pygame.Surface((window_width, window_height)).convert()
+            self.canvas = self.screen
+        else:
+            self.screen = pygame.Surface((window_width // factor, window_height // factor)).convert()
+            self.canvas = ScaledCanvas(self.screen, factor)
+        self.width, self.height = self.screen.get_size()
+        self.scoreboard = Scoreboard(self.world_width)
+
+        # --- Load only what the Get Ready screen needs; the rest is fetched when first drawn ---
+        self.get_ready_image = asset_cache.get_image(GET_READY)
+
+        # --- Load Background and Ground Images ---
+        # The opaque copy blits faster than the cached per-pixel-alpha surface
+        self.background_image = asset_cache.get_image('assets/background.png', (self.width, self.height)).convert()
+        self.bg_x1 = 0
+        self.bg_x2 = self.width
+        self.ground_image = asset_cache.get_image('assets/groundSnow.png')
+        if factor > 1:
+            ground_width, ground_height = self.ground_image.get_size()
+            self.ground_image = asset_cache.get_image(
+                'assets/groundSnow.png', (ground_width // factor, ground_height // factor)
+            )
+        self.ground_width = self.ground_image.get_width()
+        self.ground_y = self.height - self.ground_image.get_height()
+        self.ground_scroll = 0
+        self.ground_offset = 0
+        self.alpha = 1.0
+        self.num_ground_tiles = math.ceil(self.width / self.ground_width) + 1
+
+        self.backdrop = None
+        self.previous_rects = []
+        self.set_mode(mode)
+
+    def preload(self):
+        """Shrinks every sprite for the canvas ahead of play, so no gameplay frame smoothscales one.
+
+        This decodes every image it hasn't yet, so call it once the assets
+        have loaded rather than before the first frame. Does nothing at a
+        render scale of 1.
+        """
+        if self.factor > 1:
+            self.canvas.preload(self.sprite_images())
+
+    def sprite_images(self):
+        """Returns every image surface draw_state() blits through the canvas; text is rendered as it changes."""
+        # The backdrop and ground are loaded at the internal size already
+        entries = sprite_manifest() + ui_manifest(self.world_width, self.world_height)[2:]
+        images = [asset_cache.get_image(path, size) for path, size in entries]
+        images += self.sim.player.rotations.frames
+        images.append(asset_cache.get_solid_surface((PILLAR_WIDTH, self.sim.height), Obstacle.body_color))
+        return images
+
+    def set_mode(self, mode):
+        """Switches between 'full' and 'dirty' rendering."""
+        if mode not in RENDER_MODES:
+            raise ValueError(f"unknown render mode {mode!r}")
+        self.mode = mode
+        if mode == 'dirty' and self.backdrop is None:
+            self.backdrop = self.build_backdrop()
+        self.previous_rects = []
+        self.needs_full_redraw = True
+
+    def toggle_mode(self):
+        self.set_mode('dirty' if self.mode == 'full' else 'full')
+
+    def build_backdrop(self):
+        """Composites the background and ground into one strip a tile wider than the screen."""
+        strip_width = self.num_ground_tiles * self.ground_width
+        strip = pygame.Surface((strip_width, self.height)).convert()
+        for x in range(0, strip_width, self.width):
+            strip.blit(self.background_image, (x, 0))
+        for i in range(self.num_ground_tiles):
+            strip.blit(self.ground_image, (i * self.ground_width, self.ground_y))
+        return strip
+
+    def advance_scroll(self, elapsed):
+        """Scrolls the backdrop by `elapsed` 60 Hz frames of wall-clock time."""
+        scroll = self.sim.scroll_speed * elapsed / self.factor
+        bg_scroll = scroll / 2
+        self.bg_x1 -= bg_scroll
+        self.bg_x2 -= bg_scroll
+        if self.bg_x1 <= -self.width: self.bg_x1 = self.bg_x2 + self.width
+        if self.bg_x2 <= -self.width: self.bg_x2 = self.bg_x1 + self.width
+        self.ground_offset = self.ground_scroll
+        # Wrap with the remainder so fractional steps don't jump back to 0
+        self.ground_scroll = (self.ground_scroll - scroll) % -self.ground_width
+
+    def render(self, game_state, alpha=1.0, elapsed=1.0):
+        """Draws one frame. Returns the rects to pass to display.update, or None for the whole screen.
+
+        alpha is how far the display time has got between the sim's last two
+        steps; elapsed is the wall-clock time since the last frame, in 60 Hz frames.
+        """
+        if self.window is None:
+            raise ValueError("an offscreen SceneRenderer has no window to render to; use draw_frame()")
+        rects = self.draw_frame(game_state, alpha, elapsed)
+        if self.factor > 1:
+            rects = self.upscale(rects)
+            profiler.mark('upscale')
+        return rects
+
+    def draw_frame(self, game_state, alpha=1.0, elapsed=1.0):
+        """Draws one frame to self.screen, at the internal resolution, without scaling it to the window.
+
+        Returns the changed rects in self.screen's coordinates, or None for all of it.
+        """
+        self.alpha = alpha
+        self.advance_scroll(elapsed)
+        if self.mode == 'full':
+            self.draw_full_backdrop()
+            profiler.mark('background')
+            self.draw_overlay(game_state)
+            profiler.mark('draw')
+            return None
+        return self.render_dirty(game_state)
+
+    def upscale(self, rects):
+        """Scales the offscreen surface, or just `rects` of it, up to the window. Returns the window rects."""
+        k = self.factor
+        if rects is None:
+            pygame.transform.scale(self.screen, self.window.get_size(), self.window)
+            return None
+        bounds = self.screen.get_rect()
+        scaled = []
+        for rect in rects:
+            rect = rect.clip(bounds)
+            if rect.width and rect.height:
+                target = pygame.Rect(rect.x * k, rect.y * k, rect.width * k, rect.height * k)
+                pygame.transform.scale(self.screen.subsurface(rect), target.size, self.window.subsurface(target))
+                scaled.append(target)
+        return scaled
+
+    def draw_full_backdrop(self):
+        screen = self.screen
+        screen.blit(self.background_image, (self.bg_x1, 0))
+        screen.blit(self.background_image, (self.bg_x2, 0))
+        for i in range(self.num_ground_tiles):
+            screen.blit(self.ground_image, (i * self.ground_width + self.ground_offset, self.ground_y))
+
+    def render_dirty(self, game_state):
+        screen = self.screen
+        backdrop = self.backdrop
+        if self.needs_full_redraw:
+            screen.blit(backdrop, (0, 0))
+            dirty = [screen.get_rect()]
+            self.needs_full_redraw = False
+        else:
+            # Erase last frame's sprites with the still sky from the backdrop
+            for rect in self.previous_rects:
+                screen.blit(backdrop, rect, rect)
+            dirty = self.previous_rects
+
+        ground_band = pygame.Rect(0, self.ground_y, self.width, self.height - self.ground_y)
+        source = ground_band.move(int(-self.ground_offset), 0)
+        screen.blit(backdrop, ground_band, source)
+        dirty.append(ground_band)
+        profiler.mark('background')
+
+        drawn = self.draw_overlay(game_state)
+        dirty.extend(drawn)
+        profiler.mark('draw')
+        self.previous_rects = drawn
+        return dirty
+
+    def draw_world(self):
+        """Draws the drone, its mass and every live entity. Returns the areas touched."""
+        screen = self.canvas
+        sim = self.sim
+        alpha = self.alpha
+        drawn = [sim.player.draw(screen, alpha), draw_mass(self.screen, sim.player, alpha, self.factor)]
+        # Entities are drawn at the interpolated scroll; their rects stay where step() put them
+        scroll_x = sim.previous_scroll_x + (sim.scroll_x - sim.previous_scroll_x) * alpha
+        for o in sim.obstacles:
+            drawn.append(o.draw(screen, round(o.world_x - scroll_x)))
+        for s in sim.stars:
+            drawn.append(s.draw(screen, round(s.world_x - scroll_x)))
+        return drawn
+
+    def draw_overlay(self, game_state):
+        """Draws the sprites, UI and profiler overlay. Returns the areas touched."""
+        drawn = self.draw_state(game_state)
+        if profiler.overlay_visible:
+            area = profiler.draw_overlay(self.canvas)
+            if area is not None: drawn.append(area)
+        return drawn
+
+    def draw_state(self, game_state):
+        """Draws the sprites and UI for the current game state. Returns the areas touched."""
+        screen = self.canvas
+        width, height = self.world_width, self.world_height
+        scoreboard = self.scoreboard
+        if game_state == "START":
+            ready_rect = self.get_ready_image.get_rect(center=(width/2, height/2))
+            return [screen.blit(self.get_ready_image, ready_rect)]
+
+        drawn = self.draw_world()
+        scoreboard.score = self.sim.score
+        scoreboard.star_count = self.sim.star_count
+        if game_state == "PLAYING":
+            drawn.append(scoreboard.draw(screen))
+            return drawn
+
+        game_over_image = asset_cache.get_image(GAME_OVER)
+        game_over_rect = game_over_image.get_rect(center=(width/2, height/2 - 150))
+        drawn.append(screen.blit(game_over_image, game_over_rect))
+        ui_bg_image = asset_cache.get_image(UI_BACKGROUND)
+        ui_bg_rect = ui_bg_image.get_rect(center=(width/2, height/2 + 20))
+        drawn.append(screen.blit(ui_bg_image, ui_bg_rect))
+        medal_to_show = None
+        bronze, silver, gold = MEDALS
+        if scoreboard.score >= 20: medal_to_show = asset_cache.get_image(gold)
+        elif scoreboard.score >= 10: medal_to_show = asset_cache.get_image(silver)
+        elif scoreboard.score >= 5: medal_to_show = asset_cache.get_image(bronze)
+        if medal_to_show:
+            medal_rect = medal_to_show.get_rect(center=(width/2 - 60, height/2 + 25))
+            drawn.append(screen.blit(medal_to_show, medal_rect))
+        final_score_text = f"{scoreboard.score}"
+        score_surf = text_cache.render(final_score_text, 40, WHITE)
+        score_rect = score_surf.get_rect(center=(width/2 + 70, height/2 + 5))
+        drawn.append(screen.blit(score_surf, score_rect))
+        star_icon = asset_cache.get_image(*STAR_ICON)
+        star_icon_rect = star_icon.get_rect(center=(width/2 + 45, height/2 + 50))
+        drawn.append(screen.blit(star_icon, star_icon_rect))
+        star_count_text = f"x {scoreboard.star_count}"
+        star_surf = text_cache.render(star_count_text, 40, WHITE)
+        star_rect = star_surf.get_rect(midleft=star_icon_rect.midright)
+        drawn.append(screen.blit(star_surf, star_rect))
+        restart_surf = text_cache.render('Press SPACE to Restart', 40, WHITE)
+        restart_rect = restart_surf.get_rect(center=(width/2, height/2 + 150))
+        drawn.append(screen.blit(restart_surf, restart_rect))
+        return drawn
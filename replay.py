@@ -0,0 +1,173 @@
+# replay.py
+
+import argparse
+import struct
+import time
+import zlib
+
+# --- File layout (little-endian) ---
+# header: magic, version, seed (u64), tick rate (u16), hash interval (u16), frame count (u32),
+#         run count (u32), hash count (u32)
+# runs:   one action byte + LEB128 run length per run of identical actions
+# hashes: one u32 CRC of the simulation state every `hash_interval` frames
+MAGIC = b'DRPL'
+VERSION = 6
+HEADER = struct.Struct('<4sBQHHIII')
+
+def state_hash(sim):
+    """CRC32 of the parts of the world state that any desync would show up in."""
+    p = sim.player
+    packed = struct.pack(
+        '<8d5i',
+        p.position.x, p.position.y, p.velocity.x, p.velocity.y,
+        p.rotation_angle, p.mass_angle, p.mass_angular_velocity, sim.scroll_speed,
+        sim.frame, sim.score, sim.star_count, len(sim.obstacles), sim.course.spawned,
+    )
+    return zlib.crc32(packed)
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+class ReplayRecorder:
+    def __init__(self, seed, tick_rate=60, hash_interval=60):
+        """Records the per-tick action bitfield of one episode as run-length encoded runs."""
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.hash_interval = hash_interval
+        self.runs = []  # [action, length] pairs
+        self.hashes = []
+        self.frame_count = 0
+
+    def record(self, action, sim=None):
+        """Call once per simulation step with the action that was applied (and the sim, after the step)."""
+        if self.runs and self.runs[-1][0] == action:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([action, 1])
+        self.frame_count += 1
+        if sim is not None and self.hash_interval and self.frame_count % self.hash_interval == 0:
+            self.hashes.append(state_hash(sim))
+
+    def to_bytes(self):
+        out = bytearray(HEADER.pack(
+            MAGIC, VERSION, self.seed, self.tick_rate, self.hash_interval,
+            self.frame_count, len(self.runs), len(self.hashes),
+        ))
+        for action, length in self.runs:
+            out.append(action)
+            write_varint(out, length)
+        out += struct.pack(f'<{len(self.hashes)}I', *self.hashes)
+        return bytes(out)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+class Replay:
+    def __init__(self, seed, tick_rate, hash_interval, frame_count, runs, hashes):
+        """A loaded recording: the seed, tick rate, action runs and periodic state hashes."""
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.hash_interval = hash_interval
+        self.frame_count = frame_count
+        self.runs = runs
+        self.hashes = hashes
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, seed, tick_rate, hash_interval, frame_count, run_count, hash_count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("not a replay file")
+        if version != VERSION:
+            raise ValueError(f"unsupported replay version {version}")
+        pos = HEADER.size
+        runs = []
+        for _ in range(run_count):
+            action = data[pos]
+            length, pos = read_varint(data, pos + 1)
+            runs.append((action, length))
+        hashes = list(struct.unpack_from(f'<{hash_count}I', data, pos))
+        return cls(seed, tick_rate, hash_interval, frame_count, runs, hashes)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    def actions(self):
+        """Yields the recorded action for every frame in order."""
+        for action, length in self.runs:
+            for _ in range(length):
+                yield action
+
+class ReplayPlayer:
+    def __init__(self, replay):
+        """Feeds a Replay back into a Simulation frame by frame and watches for desync."""
+        self.replay = replay
+        self._actions = replay.actions()
+        self.frame = 0
+        self.desync_frame = None
+
+    def next_action(self):
+        """Returns the next recorded action, or None once the recording is exhausted."""
+        return next(self._actions, None)
+
+    def verify(self, sim):
+        """Call after each step; compares the state hash whenever one was recorded for this frame."""
+        self.frame += 1
+        interval = self.replay.hash_interval
+        if not interval or self.frame % interval or self.desync_frame is not None:
+            return True
+        index = self.frame // interval - 1
+        if index < len(self.replay.hashes) and self.replay.hashes[index] != state_hash(sim):
+            self.desync_frame = self.frame
+            return False
+        return True
+
+def play_headless(replay, sim=None):
+    """Re-runs a recording at full speed without a window. Returns its final stats."""
+    if sim is None:
+        from simulation import Simulation
+        sim = Simulation(tick_rate=replay.tick_rate)
+    sim.reset(replay.seed)
+    player = ReplayPlayer(replay)
+    while True:
+        action = player.next_action()
+        if action is None:
+            break
+        sim.step(action)
+        player.verify(sim)
+    return {
+        'frames': sim.frame,
+        'score': sim.score,
+        'stars': sim.star_count,
+        'crashed': sim.done,
+        'desync_frame': player.desync_frame,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a recorded run headless at maximum speed.")
+    parser.add_argument('path')
+    args = parser.parse_args()
+
+    replay = Replay.load(args.path)
+    start = time.perf_counter()
+    result = play_headless(replay)
+    elapsed = time.perf_counter() - start
+    for key, value in result.items():
+        print(f"{key}: {value}")
+    print(f"replayed {replay.frame_count} frames at {replay.tick_rate} Hz in {elapsed:.3f}s")
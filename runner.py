@@ -0,0 +1,101 @@
+# runner.py
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from simulation import Simulation, ACTION_NONE, ACTION_UP
+from autopilot import Autopilot
+
+FPS = 60
+
+def gap_seeking_policy(sim):
+    """Simple bot: thrust whenever the drone sits below the middle of the next pillar gap."""
+    player = sim.player
+    target_y = sim.height / 2
+    for o in sim.obstacles:
+        if hasattr(o, 'gap_y') and o.top_rect.right > player.rect.left - 10:
+            target_y = o.gap_y + o.gap_size / 2
+            break
+    if player.position.y > target_y and player.velocity.y > -2:
+        return ACTION_UP
+    return ACTION_NONE
+
+def run_episode(sim, seed, policy, max_steps):
+    """Plays one seeded episode to the crash (or max_steps) and returns its stats."""
+    sim.reset(seed)
+    done = False
+    while not done and sim.frame < max_steps:
+        reward, done, events = sim.step(policy(sim))
+    return {'seed': seed, 'frames': sim.frame, 'score': sim.score, 'stars': sim.star_count}
+
+def run_chunk(seeds, policy, max_steps):
+    """Worker entry point: one Simulation is reused for a whole chunk of seeds."""
+    sim = Simulation()
+    return [run_episode(sim, seed, policy, max_steps) for seed in seeds]
+
+def summarize(results):
+    """Aggregates per-episode stats into survival time, score and star totals."""
+    n = len(results)
+    frames = sorted(r['frames'] for r in results)
+    scores = sorted(r['score'] for r in results)
+    return {
+        'episodes': n,
+        'mean_survival_s': sum(frames) / n / FPS,
+        'median_survival_s': frames[n // 2] / FPS,
+        'max_survival_s': frames[-1] / FPS,
+        'mean_score': sum(scores) / n,
+        'max_score': scores[-1],
+        'total_stars': sum(r['stars'] for r in results),
+        'mean_stars': sum(r['stars'] for r in results) / n,
+    }
+
+def run_episodes(seeds, policy=gap_seeking_policy, max_steps=36000, workers=None, chunk_size=None):
+    """Spreads seeded headless episodes over a process pool and returns (summary, results).
+
+    Results come back in seed order, so the same seeds always give the same
+    output regardless of the number of workers. The policy must be a
+    module-level function or a picklable object, such as an Autopilot, so it
+    can be sent to the workers.
+    """
+    seeds = list(seeds)
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        # A few chunks per worker keeps the pool balanced without much IPC
+        chunk_size = max(1, len(seeds) // (workers * 4))
+    chunks = [seeds[i:i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+
+    results = []
+    if workers == 1:
+        for chunk in chunks:
+            results.extend(run_chunk(chunk, policy, max_steps))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            n = len(chunks)
+            for chunk_results in pool.map(run_chunk, chunks, [policy] * n, [max_steps] * n):
+                results.extend(chunk_results)
+    return summarize(results), results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run seeded headless episodes in parallel.")
+    parser.add_argument('--episodes', type=int, default=1000)
+    parser.add_argument('--first-seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-steps', type=int, default=36000)
+    parser.add_argument('--policy', choices=['gap', 'autopilot'], default='gap',
+                        help="gap-seeking bot or beam-search autopilot (planned without a time limit)")
+    args = parser.parse_args()
+    policy = gap_seeking_policy if args.policy == 'gap' else Autopilot(budget_ms=None)
+
+    start = time.perf_counter()
+    summary, results = run_episodes(
+        range(args.first_seed, args.first_seed + args.episodes),
+        policy=policy,
+        max_steps=args.max_steps,
+        workers=args.workers,
+    )
+    elapsed = time.perf_counter() - start
+    frames = sum(r['frames'] for r in results)
+    for key, value in summary.items():
+        print(f"{key}: {value}")
+    print(f"{elapsed:.2f}s, {args.episodes / elapsed:.1f} episodes/s, {frames / elapsed:.0f} steps/s")
@@ -0,0 +1,322 @@
+# simulation.py
+
+import math
+import random
+from collections import deque
+from drone import Drone
+from game_elements import Obstacle, Star, Puff, FloatingRock, EntityPool
+from assets import asset_cache
+from collision import CollisionIndex
+from course import Course
+from profiler import profiler
+
+# --- Actions are a bitfield of the thrust keys held this frame ---
+ACTION_NONE = 0
+ACTION_UP = 1
+ACTION_DOWN = 2
+
+BASE_SCROLL_SPEED = 5
+# Speeds, forces and timers are tuned in 60 Hz frames; other tick rates scale by dt
+REFERENCE_RATE = 60
+
+# Swept masks are tested at poses no further apart than this, in pixels
+SWEEP_STEP = 4
+
+SPAWN_CLASSES = {'pillar': Obstacle, 'rock': FloatingRock, 'puff': Puff}
+
+class Simulation:
+    def __init__(self, width=1280, height=720, seed=None, tick_rate=REFERENCE_RATE):
+        """Creates a headless game world; nothing here draws, plays sound or sleeps.
+
+        Each step() advances the world by 1/tick_rate seconds.
+        """
+        self.width = width
+        self.height = height
+        self.tick_rate = tick_rate
+        self.dt = REFERENCE_RATE / tick_rate
+        ground_image = asset_cache.get_image('assets/groundSnow.png')
+        self.ground_y = height - ground_image.get_height()
+
+        self.player = Drone(width, height)
+        self.pool = EntityPool(width, height)
+        self.obstacles = []
+        self.stars = []
+        self.obstacle_index = CollisionIndex()
+        self.star_index = CollisionIndex()
+        self.pending_pillars = deque()  # pillars not yet passed, oldest first
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """Starts a new episode. A seed of None picks a fresh one, kept in self.seed."""
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        self.player.reset(self.width, self.height)
+        for entity in self.obstacles: self.pool.release(entity)
+        for entity in self.stars: self.pool.release(entity)
+        self.obstacles.clear()
+        self.stars.clear()
+        self.obstacle_index.clear()
+        self.star_index.clear()
+        self.pending_pillars.clear()
+        self.score = 0
+        self.star_count = 0
+        self.frame = 0
+        self.done = False
+
+        # --- The course draws from its own rng, so wind never shifts it ---
+        self.course = self.make_course(self.rng.getrandbits(32))
+
+        # --- Wind state ---
+        self.wind_timer = 300
+        self.wind_strength = 0
+        # The rng only draws when the wind changes, so its state is cached per change
+        self.wind_changes = 0
+        self.rng_state = (0, self.rng.getstate())
+        self.scroll_speed = BASE_SCROLL_SPEED
+        # Total distance scrolled; world x = screen x + scroll_x
+        self.scroll_x = 0.0
+        self.previous_scroll_x = 0.0
+
+    def step(self, action):
+        """Advances the world by one tick. Returns (reward, done, events)."""
+        if self.done:
+            return 0, True, []
+
+        events = []
+        score_before = self.score
+        self.frame += 1
+
+        if action & ACTION_UP: self.player.move_up()
+        if action & ACTION_DOWN: self.player.move_down()
+
+        self.update_wind()
+        self.update_spawner()
+        profiler.mark('spawn')
+
+        # Entities are anchored in world space; scrolling is this one shared offset
+        self.previous_scroll_x = self.scroll_x
+        self.scroll_x += self.scroll_speed * self.dt
+        self.player.update(self.dt)
+        profiler.mark('physics')
+        scroll_x = self.scroll_x
+        for o in self.obstacles: o.update(scroll_x)
+        for s in self.stars: s.update(scroll_x)
+        profiler.mark('entities')
+
+        self.check_collisions(events)
+        self.cull_offscreen()
+        profiler.mark('collision')
+        return self.score - score_before, self.done, events
+
+    def update_wind(self):
+        """Counts down to the next wind change and sets the scroll speed."""
+        self.wind_timer -= self.dt
+        if self.wind_timer <= 0:
+            wind_choice = self.rng.choice(['tailwind', 'headwind', 'none', 'none'])
+            if wind_choice == 'tailwind': self.wind_strength = 1.0
+            elif wind_choice == 'headwind': self.wind_strength = -0.5
+            else: self.wind_strength = 0
+            self.wind_timer = self.rng.randint(240, 480)
+            self.wind_changes += 1
+        self.scroll_speed = BASE_SCROLL_SPEED + self.wind_strength
+
+    def make_course(self, seed):
+        return Course(seed, self.width, self.height)
+
+    def try_spawn_star(self, event):
+        """Places the course's star in a pillar's gap, unless three are already live."""
+        if event.star_y is not None and len(self.stars) < 3:
+            star = self.pool.acquire(Star)
+            star.spawn(event, self.scroll_x)
+            self.stars.append(star)
+            self.star_index.insert(star, star.hitboxes, self.scroll_x)
+
+    def add_obstacle(self, event):
+        """Spawns a pooled obstacle and adds it to the draw list and the collision index."""
+        obstacle = self.pool.acquire(SPAWN_CLASSES[event.kind])
+        obstacle.spawn(event, self.scroll_x)
+        self.obstacles.append(obstacle)
+        self.obstacle_index.insert(obstacle, obstacle.hitboxes, self.scroll_x)
+        if event.kind == 'pillar':
+            self.pending_pillars.append(obstacle)
+            self.try_spawn_star(event)
+        return obstacle
+
+    def update_spawner(self):
+        """Spawns every course event the right edge of the screen has reached."""
+        course = self.course
+        spawn_edge = self.scroll_x + self.width
+        if course.next_x() > spawn_edge:
+            # Quiet frame: compute the course ahead of the camera now
+            course.prefetch()
+            return
+        while course.next_x() <= spawn_edge:
+            self.add_obstacle(course.pop(self.score))
+
+    def snapshot(self):
+        """Captures the whole world as tuples of numbers and SpawnEvents for restore().
+
+        Entities are recorded by the immutable SpawnEvent they came from and
+        the scroll they spawned at, so nothing is deep-copied and a restored
+        entity gets exactly the same hitboxes. Cheap enough to call hundreds
+        of times a frame.
+        """
+        passed = 0
+        for o in self.obstacles:
+            if o.event.kind == 'pillar' and o.passed:
+                passed += 1
+        return (
+            self.frame, self.score, self.star_count, self.done,
+            self.wind_timer, self.wind_strength, self.scroll_speed, self.scroll_x, self.previous_scroll_x,
+            self.player.snapshot(),
+            self.course.snapshot(),
+            self.wind_changes, self.current_rng_state(),
+            tuple([(o.event, o.spawn_scroll_x) for o in self.obstacles]),
+            tuple([(s.event, s.spawn_scroll_x) for s in self.stars]),
+            passed,
+        )
+
+    def current_rng_state(self):
+        changes, state = self.rng_state
+        if changes != self.wind_changes:
+            state = self.rng.getstate()
+            self.rng_state = (self.wind_changes, state)
+        return state
+
+    def restore(self, snapshot):
+        """Returns the world to a snapshot() of this Simulation's current episode."""
+        (self.frame, self.score, self.star_count, self.done,
+         self.wind_timer, self.wind_strength, self.scroll_speed, self.scroll_x, self.previous_scroll_x,
+         player, course, wind_changes, rng_state, obstacle_spawns, star_spawns, passed) = snapshot
+        self.player.restore(player)
+        self.course.restore(course)
+        if wind_changes != self.wind_changes:
+            self.rng.setstate(rng_state)
+            self.wind_changes = wind_changes
+            self.rng_state = (wind_changes, rng_state)
+        self.restore_entities(self.obstacles, self.obstacle_index, obstacle_spawns, None)
+        self.restore_entities(self.stars, self.star_index, star_spawns, Star)
+
+        # Passed pillars are always the oldest ones still live
+        self.pending_pillars.clear()
+        for o in self.obstacles:
+            if o.event.kind == 'pillar':
+                o.passed = passed > 0
+                if passed > 0:
+                    passed -= 1
+                else:
+                    self.pending_pillars.append(o)
+
+    def restore_entities(self, entities, index, spawns, cls):
+        """Rebuilds an entity list from (SpawnEvent, scroll) pairs, keeping entities that are unchanged."""
+        wanted = {id(event) for event, spawn_scroll_x in spawns}
+        kept = {}
+        for entity in entities:
+            if id(entity.event) in wanted:
+                kept[id(entity.event)] = entity
+            else:
+                index.remove(entity)
+                self.pool.release(entity)
+        entities.clear()
+        for event, spawn_scroll_x in spawns:
+            entity = kept.get(id(event))
+            if entity is None or entity.spawn_scroll_x != spawn_scroll_x:
+                entity = self.pool.acquire(cls or SPAWN_CLASSES[event.kind])
+                entity.spawn(event, spawn_scroll_x)
+                index.insert(entity, entity.hitboxes, spawn_scroll_x)
+            entity.update(self.scroll_x)
+            entities.append(entity)
+
+    def check_collisions(self, events):
+        """Collects stars, scores passed pillars, bounces the mass and ends the episode on a crash.
+
+        Hits are swept from where the last tick left the drone and its mass,
+        so a long step (a low tick rate, a tailwind) can't carry them through
+        a star or the edge of an obstacle.
+        """
+        player = self.player
+        rect = player.rect
+        sx = self.scroll_x
+        previous_sx = self.previous_scroll_x
+        # How far the drone moved through the world this tick
+        dx = player.position.x + sx - player.previous_position.x - previous_sx
+        dy = player.position.y - player.previous_position.y
+        for star in self.star_index.sweep(rect.left + sx - dx, rect.top - dy, rect.right + sx - dx, rect.bottom - dy, dx, dy):
+            self.score += 5
+            self.star_count += 1
+            self.stars.remove(star)
+            self.star_index.remove(star)
+            self.pool.release(star)
+            events.append('star')
+
+        # Pillars are passed in spawn order, so only the oldest unpassed one needs checking
+        pending = self.pending_pillars
+        while pending and pending[0].top_rect.right < rect.left:
+            pending.popleft().passed = True
+            self.score += 1
+
+        half_w, half_h = player.hit_rotations.max_offset
+        if self.swept_mask_hit(player.hit_mask, player.position, half_w, half_h, dx, dy):
+            self.crash(events)
+
+        # The mass never crashes the drone; it bounces off, once per contact
+        mass = player.mass_position
+        previous_mass = player.previous_mass_position
+        r = player.mass_radius
+        touching = self.swept_mask_hit(
+            player.mass_hit_mask, mass, r, r,
+            mass.x + sx - previous_mass.x - previous_sx, mass.y - previous_mass.y,
+        )
+        if touching and not player.mass_touching:
+            player.mass_collide()
+            events.append('bump')
+        player.mass_touching = touching
+
+        if rect.top <= 0 or rect.bottom >= self.ground_y + 10:
+            self.crash(events)
+
+    def swept_mask_hit(self, place, centre, half_w, half_h, dx, dy):
+        """True if the mask from place(alpha, shift) touched an obstacle at any point of the last tick.
+
+        centre is where the mask ended up on screen, (dx, dy) how far it moved
+        through the world, and half_w, half_h bound its half size. The swept
+        bounding box picks the candidates; the mask is then tested at poses at
+        most SWEEP_STEP pixels apart, ending with the current one.
+        """
+        sx = self.scroll_x
+        # One pixel of slack for the rounding in place()
+        left = centre.x - half_w - 1 - dx + sx
+        top = centre.y - half_h - 1 - dy
+        candidates = self.obstacle_index.sweep(left, top, left + 2 * half_w + 2, top + 2 * half_h + 2, dx, dy)
+        if not candidates:
+            return False
+        shift = self.previous_scroll_x - sx
+        steps = max(1, math.ceil(max(abs(dx), abs(dy)) / SWEEP_STEP))
+        for k in range(1, steps + 1):
+            mask, mask_left, mask_top = place(k / steps, shift)
+            for entity in candidates:
+                if entity.overlaps_mask(mask, mask_left, mask_top):
+                    return True
+        return False
+
+    def crash(self, events):
+        if not self.done:
+            self.done = True
+            events.append('crash')
+
+    def cull_offscreen(self):
+        """Returns obstacles and stars that have scrolled off the left edge to the pool."""
+        # Entities spawn at the right edge and scroll together, so the lists stay in x order
+        self.cull_list(self.obstacles, self.obstacle_index)
+        self.cull_list(self.stars, self.star_index)
+
+    def cull_list(self, entities, index):
+        end = 0
+        while end < len(entities) and entities[end].right() <= 0:
+            index.remove(entities[end])
+            self.pool.release(entities[end])
+            end += 1
+        if end: del entities[:end]
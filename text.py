@@ -0,0 +1,53 @@
+# text.py
+
+import pygame
+from collections import OrderedDict
+
+class TextCache:
+    def __init__(self, max_entries=256):
+        """Caches fonts and rendered text surfaces, evicting the least recently used text."""
+        self.max_entries = max_entries
+        self._fonts = {}
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, size, name=None):
+        """Returns a shared Font; name=None is pygame's default font."""
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(name, size)
+            self._fonts[key] = font
+        return font
+
+    def render(self, text, size, color, name=None, antialias=True):
+        """Returns the rendered surface for text, only calling font.render() on a miss."""
+        key = (text, size, color, name, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.get_font(size, name).render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def stats(self):
+        return {
+            'fonts': len(self._fonts),
+            'entries': len(self._surfaces),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def clear(self):
+        self._fonts.clear()
+        self._surfaces.clear()
+
+# --- Shared instance used by the HUD and game-over screen ---
+text_cache = TextCache()